@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cable category switch latency: pooled fields vs destroy-and-rebuild
+
+Needs a display (run under xvfb-run on headless machines).
+Usage: python -m benchmarks.bench_category_switch [--switches N]
+"""
+
+import argparse
+import statistics
+import time
+import tkinter as tk
+
+from cable_gui import CableGeneratorApp
+
+
+def timed(root, action, count):
+    """Per-call milliseconds of action() including the resulting layout"""
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        action(i)
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:>10}: mean {statistics.mean(samples):6.2f} ms  p95 {p95:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=200)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    app = CableGeneratorApp(root)
+    root.update()
+
+    categories = ('feeder', 'cluster')
+    report('pooled', timed(root, lambda i: app.select_cable_category(categories[i % 2]),
+                           args.switches))
+
+    def rebuild(i):
+        # What every switch cost before pooling: destroy and recreate the fields
+        pool = app.create_cable_fields(categories[i % 2])
+        pool['frame'].grid(row=0, column=0, sticky='ew')
+        pool['frame'].destroy()
+    report('rebuild', timed(root, rebuild, args.switches))
+
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
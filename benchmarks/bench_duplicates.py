@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Duplicate detection benchmark: rows/s with in-memory hashing and with sorted runs
+
+Usage: python -m benchmarks.bench_duplicates [--rows N] [--max-keys N]
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_batch import process_rows
+from cable_duplicates import MAX_KEYS, find_duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--max-keys', type=int, default=100_000,
+                        help="key limit for the external sort run (default %(default)s)")
+    args = parser.parse_args()
+
+    rows = list(process_rows({key: str(value) for key, value in zip(COLUMNS, values)}
+                             for values in sample_rows(args.rows)))
+    results = {}
+    for label, max_keys in (('hashing', max(MAX_KEYS, args.rows + 1)),
+                            ('external sort', args.max_keys)):
+        start = time.perf_counter()
+        findings = list(find_duplicates(rows, max_keys))
+        elapsed = time.perf_counter() - start
+        kinds = Counter(finding.kind for finding in findings)
+        results[label] = findings
+        print(f"{label:14s}: {elapsed:6.2f} s, {len(rows) / elapsed:9.0f} rows/s, "
+              f"{kinds['duplicate']} duplicates, {kinds['conflict']} conflicts")
+    if results['hashing'] != results['external sort']:
+        print("MISMATCH between hashing and external sort findings")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export benchmark: CSV vs XLSX throughput and peak memory, straight from the batch pipeline
+
+Usage: python -m benchmarks.bench_export [--rows N ...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_batch import output_fieldnames, process_rows
+from cable_export import export_rows
+
+
+def pipeline(count):
+    """Processed rows, generated on the fly like run_batch does"""
+    return process_rows({key: str(value) for key, value in zip(COLUMNS, values)}
+                        for values in sample_rows(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    fieldnames = output_fieldnames(COLUMNS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.rows:
+            for ext in ('csv', 'xlsx'):
+                path = os.path.join(tmp, f"export.{ext}")
+                start = time.perf_counter()
+                export_rows(pipeline(count), path, fieldnames)
+                elapsed = time.perf_counter() - start
+                size = os.path.getsize(path)
+
+                # Peak memory is traced on a second, slower run
+                tracemalloc.start()
+                export_rows(pipeline(count), path, fieldnames)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{count:>9} rows {ext:4s}: {count / elapsed:8.0f} rows/s, "
+                      f"{size / 1e6:7.1f} MB file, peak memory {peak / 1e6:5.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import-time benchmark: headless cold start of the engine and CLI modules
+
+Runs each import in a fresh interpreter with `python -X importtime`, reports
+the cumulative import time, and checks that tkinter/ctypes stay unloaded.
+Exits with status 1 when a module exceeds --budget-ms or loads the GUI.
+
+Usage: python -m benchmarks.bench_import [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['cable_engine', 'cable_batch', 'cable_records', 'cable_generator_figma']
+GUI_MODULES = ('tkinter', '_tkinter', 'ctypes')
+
+
+def import_time(module):
+    """(cumulative import µs of module, GUI modules loaded) in a fresh interpreter"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    return cumulative, result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=30.0)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        times = []
+        loaded = ''
+        for _ in range(args.runs):
+            us, loaded = import_time(module)
+            times.append(us / 1000)
+        best, median = min(times), statistics.median(times)
+        over = median > args.budget_ms
+        failed |= over or bool(loaded)
+        print(f"{module:22s}: best {best:6.1f} ms, median {median:6.1f} ms"
+              f"{'  OVER BUDGET' if over else ''}"
+              f"{'  loads ' + loaded if loaded else ''}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
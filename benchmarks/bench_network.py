@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Network model benchmark: single-segment edit vs full rebuild
+
+Usage: python -m benchmarks.bench_network [--segments N] [--edits N]
+"""
+
+import argparse
+import random
+import time
+
+from cable_network import Network
+
+
+def build_network(segments, seed=1412):
+    """OLTs -> FDTs (feeder) -> lines (cluster), ~1 feeder per 10 lines"""
+    rnd = random.Random(seed)
+    network = Network()
+    lines = []
+    fdts = segments // 11
+    for i in range(fdts):
+        olt, fdt = f"OLT{i % 50:03d}", f"FDT{i:06d}"
+        network.fdt(olt, fdt, route=rnd.uniform(500, 8000), slack=rnd.randrange(8),
+                    cable_type='96C/8T')
+        for j in range(10):
+            lines.append(network.line(olt, fdt, f"L{j}", route=rnd.uniform(50, 3000),
+                                      slack_fdt=1, slack_fat=rnd.randrange(12),
+                                      cable_type='24C/2T'))
+    return network, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--segments', type=int, default=500_000)
+    parser.add_argument('--edits', type=int, default=10_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    network, lines = build_network(args.segments)
+    total = network.total_length
+    build = time.perf_counter() - start
+    count = sum(1 for _ in network.segments())
+    print(f"{count} segments, full build {build:.2f} s, total {total} m")
+
+    rnd = random.Random(7)
+    start = time.perf_counter()
+    for _ in range(args.edits):
+        line = rnd.choice(lines)
+        line.update(route=rnd.uniform(50, 3000))
+        line.parent.parent.subtree_length
+    edit = (time.perf_counter() - start) / args.edits
+    print(f"edit + path refresh: {edit * 1e6:.1f} us/edit "
+          f"(x{build / edit:.0f} faster than a rebuild)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OTDR benchmark: .sor traces parsed per second, in one process and in a pool
+
+Usage: python -m benchmarks.bench_otdr [--files N] [--points N] [--workers N ...]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sample_data import sor_bytes
+from cable_otdr import otdr_table, scan_traces
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--points', type=int, default=16000,
+                        help="trace data points per file (2 bytes each)")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    rng = random.Random(1412)
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.files):
+            name = f"FDT{i // 24:04d}_{'ABCDEFGH'[i % 8]}_{i % 24 + 1:03d}.sor"
+            with open(os.path.join(tmp, name), 'wb') as f:
+                f.write(sor_bytes(rng.uniform(50, 3000), points=args.points,
+                                  version=rng.choice((1, 2))))
+        size = args.files * len(sor_bytes(1000, points=args.points)) / 1e6
+        print(f"{args.files} traces, {size:.0f} MB")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            traces = scan_traces(tmp, workers)
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for trace in traces if trace.error)
+            print(f"workers {workers:3d}: {elapsed:6.2f} s, {len(traces) / elapsed:8.0f} files/s, "
+                  f"{failed} failed")
+
+        start = time.perf_counter()
+        table = otdr_table(traces)
+        print(f"match table: {len(table)} keys in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
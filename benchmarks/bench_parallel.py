@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel batch scaling benchmark
+
+Usage: python -m benchmarks.bench_parallel [--rows N] [--max-workers N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sample_data import write_sample_csv
+from cable_batch import run_batch
+from cable_parallel import run_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1024 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, 'input.csv')
+        dst = os.path.join(tmp_dir, 'output.csv')
+        write_sample_csv(src, args.rows)
+        size_mb = os.path.getsize(src) / 1e6
+        print(f"{args.rows} rows, {size_mb:.1f} MB input, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        run_batch(src, dst)
+        baseline = time.perf_counter() - start
+        print(f"{'streaming':>10}: {baseline:7.2f} s  {args.rows / baseline:10.0f} rows/s")
+
+        workers = 1
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            run_parallel(src, dst, workers, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>3} worker{'s' if workers > 1 else ' '}: {elapsed:7.2f} s  "
+                  f"{args.rows / elapsed:10.0f} rows/s  x{baseline / elapsed:.2f}")
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
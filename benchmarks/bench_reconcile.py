@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reconciliation benchmark: rows/s of the column pass and the ranked variance report
+
+Usage: python -m benchmarks.bench_reconcile [--rows N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sample_data import COLUMNS, sample_rows, write_sample_csv
+from cable_batch import process_rows, run_batch
+from cable_engine import numpy_module
+from cable_reconcile import project_columns, reconcile, run_reconcile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = list(process_rows({key: str(value) for key, value in zip(COLUMNS, values)}
+                             for values in sample_rows(args.rows)))
+    engine = 'numpy' if numpy_module() is not None else 'pure Python'
+
+    start = time.perf_counter()
+    columns = project_columns(rows)
+    elapsed = time.perf_counter() - start
+    print(f"{'columns':14s}: {elapsed:6.2f} s, {len(rows) / elapsed:9.0f} rows/s")
+
+    start = time.perf_counter()
+    result = reconcile(columns)
+    elapsed = time.perf_counter() - start
+    print(f"{'reconcile':14s}: {elapsed:6.2f} s, {len(rows) / elapsed:9.0f} rows/s "
+          f"({engine}), {result.measured} measured, {result.flagged} flagged")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = os.path.join(tmp, 'project.csv')
+        write_sample_csv(os.path.join(tmp, 'input.csv'), args.rows)
+        run_batch(os.path.join(tmp, 'input.csv'), project)
+        start = time.perf_counter()
+        run_reconcile(project, os.path.join(tmp, 'report.csv'))
+        elapsed = time.perf_counter() - start
+        print(f"{'CSV report':14s}: {elapsed:6.2f} s, {len(rows) / elapsed:9.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
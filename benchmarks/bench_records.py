@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cable record benchmark: memory and naming throughput, dict rows vs CableRecord
+
+Usage: python -m benchmarks.bench_records [--records N] [--project N]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_batch import row_category
+from cable_engine import cluster_cable_name, feeder_cable_name
+from cable_records import CableRecord, CodePool
+
+
+def fresh_rows(count):
+    """Rows as csv.DictReader returns them, every value a new string"""
+    for values in sample_rows(count):
+        yield {key: str(value) for key, value in zip(COLUMNS, values)}
+
+
+def measure(build):
+    """(result, traced bytes, seconds) of build()"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def engine_name(row):
+    if row_category(row) == 'cluster':
+        return cluster_cable_name(row['fdt'], row['line'], row['cable_type'], row['otdr'])
+    return feeder_cable_name(row['olt'], row['fdt'], row['feeder_type'],
+                             row['cable_type'], row['otdr'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--project', type=int, default=10_000_000,
+                        help="record count the memory numbers are projected to")
+    args = parser.parse_args()
+    n = args.records
+    scale = args.project / n
+
+    rows, row_bytes, _ = measure(lambda: list(fresh_rows(n)))
+    pool = CodePool()
+    # Records are built from their own fresh rows, so the strings they keep
+    # (lengths, first copies of codes) are counted and the rest is freed
+    records, rec_bytes, rec_time = measure(
+        lambda: [CableRecord.from_row(row, pool) for row in fresh_rows(n)])
+
+    print(f"{n} records ({len(pool)} distinct strings after interning)")
+    print(f"dict rows   : {row_bytes / n:6.0f} B/record, "
+          f"~{row_bytes * scale / 1e9:.1f} GB for {args.project}")
+    print(f"CableRecord : {rec_bytes / n:6.0f} B/record, "
+          f"~{rec_bytes * scale / 1e9:.1f} GB for {args.project}, "
+          f"built from rows at {n / rec_time:.0f} records/s")
+
+    start = time.perf_counter()
+    names = [engine_name(row) for row in rows]
+    engine_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cached = [record.name for record in records]
+    record_time = time.perf_counter() - start
+    assert names == cached
+
+    print(f"names, engine f-string : {n / engine_time:10.0f} names/s "
+          f"(~{engine_time * scale:.0f} s for {args.project})")
+    print(f"names, CableRecord     : {n / record_time:10.0f} names/s "
+          f"(~{record_time * scale:.0f} s for {args.project})")
+
+
+if __name__ == '__main__':
+    main()
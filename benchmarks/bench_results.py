@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Result view benchmark: sort, filter and scroll windows over a large result set
+
+Usage: python -m benchmarks.bench_results [--rows N] [--window N]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_batch import process_row
+from cable_results import RESULT_COLUMNS, ResultView
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:28s}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--window', type=int, default=12,
+                        help="visible table rows")
+    args = parser.parse_args()
+
+    rows = (process_row({key: str(value) for key, value in zip(COLUMNS, values)})
+            for values in sample_rows(args.rows))
+    view = timed(f"generate {args.rows} rows", lambda: ResultView.from_rows(rows))
+
+    rng = random.Random(1412)
+    tops = [rng.randrange(len(view)) for _ in range(1000)]
+    start = time.perf_counter()
+    for top in tops:
+        view.window(top, args.window)
+    print(f"{'scroll window':28s}: {(time.perf_counter() - start) * 1000:8.3f} ms per 1000")
+
+    for column in RESULT_COLUMNS:
+        timed(f"sort {column} (first)", lambda: view.sort(column))
+        timed(f"sort {column} (cached)", lambda: view.sort(column, reverse=True))
+
+    name = view[rng.randrange(len(view))][0]
+    fdt = name.split(' ')[0].lower()
+    timed(f"filter '{fdt}'", lambda: view.filter(fdt))
+    print(f"{'matches':28s}: {len(view):8d}")
+    timed("sort filtered", lambda: view.sort('name'))
+    timed("clear filter", lambda: view.filter(''))
+
+
+if __name__ == '__main__':
+    main()
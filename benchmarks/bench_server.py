@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON API benchmark: requests/s over keep-alive connections from localhost
+
+Usage: python -m benchmarks.bench_server [--requests N] [--connections N] [--batch N]
+       [--batch-requests N]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_server import serve
+
+
+async def client(port, bodies, path):
+    """Send bodies one after another on a single keep-alive connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for body in bodies:
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b'\r\n':
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        json.loads(await reader.readexactly(length))
+    writer.close()
+
+
+async def run(args):
+    started = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(serve('127.0.0.1', 0, started.set_result))
+    server = await started
+    port = server.sockets[0].getsockname()[1]
+
+    rows = [dict(zip(COLUMNS, map(str, values))) for values in sample_rows(max(args.batch, 1000))]
+    single = [json.dumps(row).encode() for row in rows]
+    for label, path, bodies, requests in (
+            ('name', '/name', single, args.requests),
+            ('cluster', '/cluster', single, args.requests),
+            (f'batch x{args.batch}', '/batch', [json.dumps(rows[:args.batch]).encode()],
+             args.batch_requests)):
+        per_client = max(1, requests // args.connections)
+        work = [[bodies[(c * per_client + i) % len(bodies)] for i in range(per_client)]
+                for c in range(args.connections)]
+        start = time.perf_counter()
+        await asyncio.gather(*(client(port, w, path) for w in work))
+        elapsed = time.perf_counter() - start
+        count = per_client * args.connections
+        rows_per_request = args.batch if path == '/batch' else 1
+        print(f"{label:12s}: {count / elapsed:8.0f} requests/s, "
+              f"{count * rows_per_request / elapsed:9.0f} rows/s")
+
+    task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--batch', type=int, default=1000, help="rows per /batch request")
+    parser.add_argument('--batch-requests', type=int, default=80)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Slack counting benchmark: grid index vs naive all-pairs scan
+
+Usage: python -m benchmarks.bench_spatial [--fats N] [--routes N] [--sample N]
+"""
+
+import argparse
+import random
+import time
+
+from cable_routes import Point, Route
+from cable_spatial import SNAP_TOLERANCE, PointGrid
+
+
+def sample_layers(fats, routes, seed=1412):
+    """FAT/FDT points and 6-vertex routes scattered over a ~20 km city"""
+    rnd = random.Random(seed)
+    lon0, lat0, span = 106.7, -6.3, 0.18
+    points = [Point(f"FAT{i}", 'fat', lon0 + rnd.random() * span, lat0 + rnd.random() * span)
+              for i in range(fats)]
+    points += [Point(f"FDT{i}", 'fdt', lon0 + rnd.random() * span, lat0 + rnd.random() * span)
+               for i in range(fats // 20)]
+    lines = []
+    for i in range(routes):
+        lon, lat = lon0 + rnd.random() * span, lat0 + rnd.random() * span
+        coords = [(lon, lat)]
+        for _ in range(5):
+            lon += rnd.uniform(-0.002, 0.002)
+            lat += rnd.uniform(-0.002, 0.002)
+            coords.append((lon, lat))
+        lines.append(Route(f"LINE{i}", [coords]))
+    return points, lines
+
+
+def naive_count(grid, route, tolerance):
+    """All-pairs reference: every point against every segment"""
+    tol2 = tolerance * tolerance
+    counts = {'fdt': 0, 'fat': 0}
+    xy = [grid.project(lon, lat) for lon, lat in route.parts[0]]
+    for point, (px, py) in zip(grid.points, grid.xy):
+        for (ax, ay), (bx, by) in zip(xy, xy[1:]):
+            dx, dy = bx - ax, by - ay
+            seg2 = dx * dx + dy * dy
+            t = 0.0 if seg2 == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg2))
+            ex, ey = ax + t * dx - px, ay + t * dy - py
+            if ex * ex + ey * ey <= tol2:
+                counts[point.kind] += 1
+                break
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fats', type=int, default=100_000)
+    parser.add_argument('--routes', type=int, default=20_000)
+    parser.add_argument('--sample', type=int, default=20,
+                        help="routes timed with the naive scan (extrapolated)")
+    parser.add_argument('--tolerance', type=float, default=SNAP_TOLERANCE)
+    args = parser.parse_args()
+
+    points, routes = sample_layers(args.fats, args.routes)
+
+    start = time.perf_counter()
+    grid = PointGrid(points, tolerance=args.tolerance)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [grid.count_kinds(route.parts) for route in routes]
+    query = time.perf_counter() - start
+    print(f"{len(points)} points x {len(routes)} routes, tolerance {args.tolerance} m")
+    print(f"grid   : build {build:.2f} s, query {query:.2f} s "
+          f"({len(routes) / query:.0f} routes/s)")
+
+    start = time.perf_counter()
+    for route, counts in zip(routes[:args.sample], results):
+        expected = naive_count(grid, route, args.tolerance)
+        assert (counts['fdt'], counts['fat']) == (expected['fdt'], expected['fat'])
+    naive = (time.perf_counter() - start) / args.sample * len(routes)
+    print(f"naive  : ~{naive:.0f} s (extrapolated from {args.sample} routes), "
+          f"x{naive / (build + query):.0f} slower")
+
+
+if __name__ == '__main__':
+    main()
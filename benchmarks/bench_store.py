@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Project store benchmark: bulk save rate and indexed lookup latency
+
+Usage: python -m benchmarks.bench_store [--rows N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sample_data import COLUMNS, sample_rows
+from cable_batch import process_rows
+from cable_store import ProjectStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'project.db')
+        with ProjectStore(path) as store:
+            rows = process_rows({key: str(value) for key, value in zip(COLUMNS, values)}
+                                for values in sample_rows(args.rows))
+            start = time.perf_counter()
+            saved = store.save_many(rows)
+            elapsed = time.perf_counter() - start
+            print(f"save      : {saved} rows in {elapsed:.1f} s "
+                  f"({saved / elapsed:.0f} rows/s, generation included), "
+                  f"{os.path.getsize(path) / 1e6:.0f} MB")
+
+            rng = random.Random(1412)
+            ids = [rng.randint(1, len(store)) for _ in range(args.queries)]
+            picks = [dict(store.db.execute("SELECT name, olt, fdt, line FROM cables "
+                                           "WHERE id = ?", (i,)).fetchone()) for i in ids]
+
+            for label, query in (
+                    ('find name', lambda p: [store.find(p['name'])]),
+                    ('list fdt', lambda p: store.cables(fdt=p['fdt'])),
+                    ('list line', lambda p: store.cables(fdt=p['fdt'], line=p['line']))):
+                start = time.perf_counter()
+                found = sum(len(query(p)) for p in picks)
+                elapsed = time.perf_counter() - start
+                print(f"{label:10s}: {elapsed / len(picks) * 1000:.3f} ms/query "
+                      f"({found / len(picks):.0f} rows/query)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validation benchmark: rows/s of the bulk checks, in memory and from a CSV file
+
+Usage: python -m benchmarks.bench_validation [--rows N] [--bad FRACTION]
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sample_data import COLUMNS, sample_rows, write_sample_csv
+from cable_validation import CHUNK_ROWS, Validator, validate_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--bad', type=float, default=0.001,
+                        help="fraction of rows with an invalid FDT code")
+    args = parser.parse_args()
+
+    rng = random.Random(1412)
+    fdt = COLUMNS.index('fdt')
+    rows = []
+    for values in sample_rows(args.rows):
+        values = [str(value) for value in values]
+        if rng.random() < args.bad:
+            values[fdt] = 'FDT ' + values[fdt][3:]
+        rows.append(values)
+    validator = Validator()
+    # The input rows stay alive for the whole run, keep the GC from rescanning them
+    gc.freeze()
+
+    start = time.perf_counter()
+    issues = 0
+    checking = 0.0
+    for offset in range(0, len(rows), CHUNK_ROWS):
+        chunk = rows[offset:offset + CHUNK_ROWS]
+        columns = dict(zip(COLUMNS, zip(*chunk)))
+        check_start = time.perf_counter()
+        issues += len(validator.check_columns(columns, offset + 1))
+        checking += time.perf_counter() - check_start
+    elapsed = time.perf_counter() - start
+    print(f"{'checks only':20s}: {checking:6.2f} s, {args.rows / checking:10.0f} rows/s, "
+          f"{issues} issues")
+    print(f"{'columns in memory':20s}: {elapsed:6.2f} s, {args.rows / elapsed:10.0f} rows/s "
+          f"(with transposing the rows)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'input.csv')
+        write_sample_csv(src, args.rows)
+        start = time.perf_counter()
+        count, issues = validate_csv(src, os.path.join(tmp, 'report.csv'), validator)
+        elapsed = time.perf_counter() - start
+        print(f"{'CSV file':20s}: {elapsed:6.2f} s, {count / elapsed:10.0f} rows/s, "
+              f"{issues} issues")
+
+    row = dict(zip(COLUMNS, rows[0]))
+    start = time.perf_counter()
+    for _ in range(10000):
+        validator.check_row(row)
+    print(f"{'single row':20s}: {(time.perf_counter() - start) * 100:6.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic project data for the benchmarks
+"""
+
+import csv
+import random
+
+COLUMNS = ['id', 'category', 'olt', 'fdt', 'line', 'feeder_type', 'cable_type',
+           'route', 'slack_fdt', 'slack_fat', 'slack', 'otdr']
+
+
+def sample_rows(count, seed=1412):
+    """Yield deterministic batch input rows, 80% cluster / 20% feeder"""
+    rnd = random.Random(seed)
+    for i in range(count):
+        fdt = f"FDT{rnd.randrange(2000):04d}"
+        route = round(rnd.uniform(50, 3000), 2)
+        if rnd.random() < 0.8:
+            yield [i, 'cluster', '', fdt, f"{rnd.choice('ABCDEFGH')}{rnd.randrange(1, 30)}", '',
+                   rnd.choice(['24C/2T', '36C/3T', '48C/4T']), route,
+                   rnd.randrange(0, 3), rnd.randrange(0, 12), '', round(route * 1.08)]
+        else:
+            yield [i, 'feeder', f"OLT{rnd.randrange(50):03d}", fdt, '',
+                   rnd.choice(['SUBFEEDER', 'HUBFEEDER', 'MAINFEEDER']),
+                   rnd.choice(['24C/2T', '48C/4T', '96C/8T', '144C/12T', '288C/24T']),
+                   route, '', '', rnd.randrange(0, 8), round(route * 1.06)]
+
+
+def write_sample_csv(path, count, seed=1412):
+    """Write a batch input CSV with count rows"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(sample_rows(count, seed))
+
+
+def sor_bytes(length_m, index=1.4682, wavelength=1550, points=16000, version=2):
+    """Minimal SR-4731 trace: FxdParams, KeyEvents (start and fiber end) and DataPts"""
+    import struct
+
+    tof = round(length_m * index / (1e-10 * 299792458.0))
+
+    def block(name, body):
+        return (name.encode() + b'\0' if version == 2 else b'') + body
+
+    fxd = struct.pack('<I2sH', 0, b'mt', wavelength * 10 if version == 2 else wavelength)
+    fxd += struct.pack('<ii', 0, 0) if version == 2 else struct.pack('<i', 0)
+    fxd += struct.pack('<HHII', 1, 100, 20000, points)
+    fxd += struct.pack('<I', round(index * 100000)) + b'\0' * 40
+    events = struct.pack('<H', 2)
+    for number, event_tof, kind in ((1, 0, b'1F9999LS'), (2, tof, b'0E9999LS')):
+        events += struct.pack('<HIhhi8s', number, event_tof, 0, 150, -45000, kind)
+        events += b'\0' * 20 if version == 2 else b''
+        events += b'\0'
+    events += struct.pack('<iiIHiI', 4321, 0, tof, 40000, 0, tof)
+    data = struct.pack('<IH', points, 1) + struct.pack('<IH', points, 1000)
+    data += bytes(2 * points)
+
+    blocks = [('FxdParams', block('FxdParams', fxd)), ('KeyEvents', block('KeyEvents', events)),
+              ('DataPts', block('DataPts', data))]
+    entries = b''.join(name.encode() + b'\0' + struct.pack('<HI', 200, len(body))
+                       for name, body in blocks)
+    head = b'Map\0' if version == 2 else b''
+    map_size = len(head) + 8 + len(entries)
+    return (head + struct.pack('<HIH', 200, map_size, len(blocks) + 1) + entries
+            + b''.join(body for _, body in blocks))
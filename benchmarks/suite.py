@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite: engine micro-benchmarks, batch throughput and GUI startup/tab switch
+
+Results are written as JSON (benchmarks/results/<timestamp>.json by default)
+so runs can be compared with --compare. The GUI part needs a display; on
+headless machines run the suite under xvfb-run, otherwise it is skipped.
+
+Usage: python -m benchmarks.suite [--parts micro,throughput,gui]
+       [--sizes 10k,1m,10m] [--quick] [--json FILE] [--compare OLD.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from benchmarks.sample_data import COLUMNS, sample_rows, write_sample_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_SIZES = '10k,1m,10m'
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1m' -> 1000000"""
+    text = text.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def micro():
+    """Per-record ns/op of the naming and length math (best of 5 repeats)"""
+    from cable_batch import process_row
+    from cable_engine import (cluster_cable_name, feeder_cable_name, total_length,
+                              cluster_description, feeder_description)
+
+    rows = [dict(zip(COLUMNS, map(str, values))) for values in sample_rows(1000)]
+    cluster_row = next(row for row in rows if row['category'] == 'cluster')
+    feeder_row = next(row for row in rows if row['category'] == 'feeder')
+    cases = {
+        'cluster_cable_name': lambda: cluster_cable_name('FDT0001', 'A1', '24C/2T', '1234'),
+        'feeder_cable_name': lambda: feeder_cable_name('OLT001', 'FDT0001', 'SUBFEEDER',
+                                                       '96C/8T', '1234'),
+        'total_length': lambda: total_length(1234.5, 3.0),
+        'cluster_description': lambda: cluster_description(1234.5, 1.0, 2.0, '1300'),
+        'feeder_description': lambda: feeder_description(1234.5, 2.0, '1300'),
+        'process_row_cluster': lambda: process_row(cluster_row),
+        'process_row_feeder': lambda: process_row(feeder_row),
+    }
+    results = {}
+    for name, func in cases.items():
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(5, number)) / number
+        results[name] = {'ns_per_op': round(best * 1e9, 1)}
+        print(f"  {name:22s}: {best * 1e9:9.1f} ns/op")
+    return results
+
+
+def throughput(sizes):
+    """Rows/s of the streaming batch pipeline, file to file"""
+    from cable_batch import run_batch
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            src = os.path.join(tmp, 'input.csv')
+            dst = os.path.join(tmp, 'output.csv')
+            write_sample_csv(src, size)
+            start = time.perf_counter()
+            run_batch(src, dst)
+            elapsed = time.perf_counter() - start
+            mb = os.path.getsize(src) / 1e6
+            results[str(size)] = {'seconds': round(elapsed, 3),
+                                  'rows_per_s': round(size / elapsed),
+                                  'input_mb_per_s': round(mb / elapsed, 2)}
+            print(f"  {size:>10} rows: {elapsed:8.2f} s, {size / elapsed:9.0f} rows/s, "
+                  f"{mb / elapsed:6.2f} MB/s")
+            os.remove(src)
+            os.remove(dst)
+    return results
+
+
+def _startup():
+    """Milestones (ms) printed by --startup-timing in a fresh interpreter"""
+    result = subprocess.run([sys.executable, 'cable_generator_figma.py', '--startup-timing'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=60)
+    milestones = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'\s*(.+?):\s+([\d.]+) ms', line)
+        if match:
+            milestones[match.group(1)] = float(match.group(2))
+    return milestones
+
+
+def gui(runs=5):
+    """Cold start milestones and tab switch / generate latency of the Tk app"""
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        print("  skipped: no display (run under xvfb-run)")
+        return {'skipped': 'no display'}
+
+    import tkinter as tk
+    from cable_gui import CableGeneratorApp
+
+    startups = [_startup() for _ in range(runs)]
+    results = {'startup_ms': {label: round(statistics.median(s[label] for s in startups), 1)
+                              for label in startups[0]}}
+    for label, ms in results['startup_ms'].items():
+        print(f"  startup {label:16s}: {ms:8.1f} ms")
+
+    def timed(action, count=50):
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            action()
+            root.update_idletasks()
+            samples.append((time.perf_counter() - start) * 1000)
+        return round(statistics.median(samples), 3)
+
+    root = tk.Tk()
+    app = CableGeneratorApp(root)
+    root.update()
+    tabs = list(app.panel_builders)
+    for tab in tabs:
+        app.switch_tab(tab)
+        root.update_idletasks()
+    results['panel_build_ms'] = {tab: round(app.timings[f"{tab} panel"] * 1000, 3)
+                                 for tab in tabs if f"{tab} panel" in app.timings}
+    results['tab_switch_ms'] = {tab: timed(lambda t=tab: app.switch_tab(t)) for tab in tabs}
+
+    app.cable_entries['fdt'].insert(0, 'FDT0001')
+    app.ci_entries['route'].insert(0, '1234.5')
+    app.feeder_entries['route'].insert(0, '1234.5')
+    results['generate_ms'] = {
+        'cable': timed(lambda: app.generate_cable(save=False)),
+        'ci': timed(lambda: app.generate_ci(save=False)),
+        'feeder': timed(lambda: app.generate_feeder(save=False)),
+    }
+    root.destroy()
+
+    for group in ('panel_build_ms', 'tab_switch_ms', 'generate_ms'):
+        for label, ms in results[group].items():
+            print(f"  {group[:-3]} {label:10s}: {ms:8.3f} ms")
+    return results
+
+
+def flatten(results, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1}, numeric leaves only"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(old, new):
+    """Print metrics present in both runs with their relative change"""
+    old, new = flatten(old['results']), flatten(new['results'])
+    print("\nChange vs baseline (+ = larger value):")
+    for key in sorted(old.keys() & new.keys()):
+        if old[key]:
+            change = (new[key] - old[key]) / old[key] * 100
+            print(f"  {key:50s} {old[key]:>12} -> {new[key]:>12}  {change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--parts', default='micro,throughput,gui')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help="batch sizes for throughput (default %(default)s)")
+    parser.add_argument('--quick', action='store_true', help="throughput at 10k rows only")
+    parser.add_argument('--json', metavar='FILE', help="result file (default benchmarks/results/)")
+    parser.add_argument('--compare', metavar='OLD', help="earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    parts = [part.strip() for part in args.parts.split(',') if part.strip()]
+    sizes = [10_000] if args.quick else [parse_size(s) for s in args.sizes.split(',')]
+    run = {'meta': metadata(), 'results': {}}
+    for part in parts:
+        print(f"{part}:")
+        if part == 'micro':
+            run['results'][part] = micro()
+        elif part == 'throughput':
+            run['results'][part] = throughput(sizes)
+        elif part == 'gui':
+            run['results'][part] = gui()
+        else:
+            parser.error(f"unknown part '{part}'")
+
+    path = args.json
+    if not path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = run['meta']['timestamp'].replace(':', '').replace('-', '')
+        path = os.path.join(RESULTS_DIR, f"{stamp}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), run)
+
+
+if __name__ == '__main__':
+    main()
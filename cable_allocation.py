@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Core Allocation
+Assigns cable cores and tubes to splice points using per-cable bitsets
+"""
+
+import csv
+
+from cable_batch import open_csv
+from cable_engine import parse_cable_type
+
+ASSIGNMENT_COLUMNS = ['point', 'cable', 'core', 'tube', 'error']
+REPORT_COLUMNS = ['cable', 'cable_type', 'cores', 'used', 'free', 'free_tubes', 'utilisation']
+
+
+class AllocationError(ValueError):
+    """Raised when cores cannot be allocated"""
+
+
+class CableCores:
+    """Used-core bitset of one cable, bit n set = core n in use (0-based)
+
+    Cores and tubes are bounded by the cable type (at most 288C/24T), so
+    every operation works on a few machine words.
+    """
+    def __init__(self, name, cable_type):
+        self.name = name
+        self.cable_type = cable_type.strip().upper()
+        self.cores, self.tubes = parse_cable_type(self.cable_type)
+        self.tube_size = self.cores // self.tubes
+        self.full_mask = (1 << self.cores) - 1
+        self.tube_mask = (1 << self.tube_size) - 1
+        self.used = 0
+
+    @property
+    def used_count(self):
+        return self.used.bit_count()
+
+    @property
+    def free_count(self):
+        return self.cores - self.used.bit_count()
+
+    @property
+    def utilisation(self):
+        return self.used.bit_count() / self.cores
+
+    def tube_of(self, core):
+        """Tube index (0-based) of a core"""
+        return core // self.tube_size
+
+    def is_free(self, core):
+        return not (self.used >> core) & 1
+
+    def tube_used(self, tube):
+        """Used-core bits of one tube"""
+        return (self.used >> (tube * self.tube_size)) & self.tube_mask
+
+    def free_tubes(self):
+        return sum(1 for tube in range(self.tubes) if not self.tube_used(tube))
+
+    def _take(self, count, region):
+        """Mark the lowest count free cores inside region as used"""
+        free = ~self.used & region
+        cores = []
+        for _ in range(count):
+            low = free & -free
+            cores.append(low.bit_length() - 1)
+            free ^= low
+            self.used |= low
+        return cores
+
+    def allocate(self, count=1):
+        """Reserve count cores, kept within one tube whenever one has room"""
+        if count < 1 or count > self.free_count:
+            raise AllocationError(
+                f"{self.name}: cannot allocate {count} core(s), {self.free_count} free")
+        if count <= self.tube_size:
+            for tube in range(self.tubes):
+                if self.tube_size - self.tube_used(tube).bit_count() >= count:
+                    return self._take(count, self.tube_mask << (tube * self.tube_size))
+        return self._take(count, self.full_mask)
+
+    def allocate_tube(self):
+        """Reserve a whole empty tube, returns its cores"""
+        for tube in range(self.tubes):
+            if not self.tube_used(tube):
+                return self._take(self.tube_size, self.tube_mask << (tube * self.tube_size))
+        raise AllocationError(f"{self.name}: no free tube")
+
+    def release(self, cores):
+        """Return cores to the free pool"""
+        for core in cores:
+            self.used &= ~(1 << core)
+
+
+class CoreAllocator:
+    """Core assignments of every cable and splice point in a network"""
+    def __init__(self):
+        self.cables = {}
+        self.assignments = {}
+
+    def add_cable(self, name, cable_type):
+        """Register a cable, a repeated name must keep its cable type"""
+        cable = self.cables.get(name)
+        if cable is None:
+            cable = self.cables[name] = CableCores(name, cable_type)
+        elif cable.cable_type != cable_type.strip().upper():
+            raise AllocationError(
+                f"{name}: cable type {cable_type} conflicts with {cable.cable_type}")
+        return cable
+
+    def allocate_path(self, point, cables, count=1, whole_tube=False):
+        """Reserve cores on every cable from feeder to cluster for one point
+
+        Nothing is reserved if any cable of the path is full. Returns a
+        list of (cable name, core) pairs.
+        """
+        taken = []
+        try:
+            for name in cables:
+                cable = self.cables[name]
+                cores = cable.allocate_tube() if whole_tube else cable.allocate(count)
+                taken.append((cable, cores))
+        except Exception:
+            for cable, cores in taken:
+                cable.release(cores)
+            raise
+
+        pairs = [(cable.name, core) for cable, cores in taken for core in cores]
+        self.assignments.setdefault(point, []).extend(pairs)
+        return pairs
+
+    def release_point(self, point):
+        """Free every core assigned to a point"""
+        for name, core in self.assignments.pop(point, []):
+            self.cables[name].release([core])
+
+    def utilisation_report(self):
+        """Yield one report row per cable"""
+        for cable in self.cables.values():
+            yield {
+                'cable': cable.name,
+                'cable_type': cable.cable_type,
+                'cores': cable.cores,
+                'used': cable.used_count,
+                'free': cable.free_count,
+                'free_tubes': cable.free_tubes(),
+                'utilisation': f"{cable.utilisation * 100:.1f}%",
+            }
+
+
+def run_allocation(input_path, output_path='-', report_path=None):
+    """Allocate cores for a CSV of splice points, return the allocator
+
+    Input columns: point, feeder, feeder_cable_type, cluster,
+    cluster_cable_type, cores (default 1). Each row reserves its cores on
+    the feeder cable (if any) and the cluster cable (if any).
+    """
+    allocator = CoreAllocator()
+    with open_csv(input_path, 'r') as src, open_csv(output_path, 'w') as dst:
+        writer = csv.DictWriter(dst, ASSIGNMENT_COLUMNS)
+        writer.writeheader()
+        for row in csv.DictReader(src):
+            def field(key):
+                return (row.get(key) or '').strip()
+
+            point = field('point')
+            try:
+                path = []
+                for cable_key, type_key in (('feeder', 'feeder_cable_type'),
+                                            ('cluster', 'cluster_cable_type')):
+                    if field(cable_key):
+                        allocator.add_cable(field(cable_key), field(type_key))
+                        path.append(field(cable_key))
+                if not path:
+                    raise AllocationError("no feeder or cluster cable")
+                pairs = allocator.allocate_path(point, path, int(field('cores') or 1))
+            except Exception as e:
+                writer.writerow({'point': point, 'error': str(e)})
+                continue
+
+            for name, core in pairs:
+                cable = allocator.cables[name]
+                writer.writerow({'point': point, 'cable': name, 'core': core + 1,
+                                 'tube': cable.tube_of(core) + 1})
+
+    if report_path:
+        with open_csv(report_path, 'w') as dst:
+            writer = csv.DictWriter(dst, REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(allocator.utilisation_report())
+    return allocator
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Batch Mode
+Streams a CSV of cable inputs through the naming and length engine
+"""
+
+import csv
+import gc
+import os
+import sys
+from contextlib import contextmanager
+from itertools import islice
+
+from cable_engine import active_profile, parse_number
+
+# Recognised input columns, any other columns are passed through unchanged
+INPUT_COLUMNS = ['category', 'olt', 'fdt', 'line', 'feeder_type', 'cable_type',
+                 'route', 'route_name', 'slack_fdt', 'slack_fat', 'slack', 'otdr']
+OUTPUT_COLUMNS = ['name', 'total_length', 'description', 'error']
+PROGRESS_ROWS = 10000  # rows between progress callbacks
+
+
+def row_category(row):
+    """Cable category of a row, rows with an OLT code default to feeder"""
+    category = (row.get('category') or '').strip().lower()
+    if category:
+        return category
+    return 'feeder' if (row.get('olt') or '').strip() else 'cluster'
+
+
+def process_row(row, routes=None, profile=None):
+    """Fill name, total length and description of one input row
+
+    routes maps route names to column values (see iter_route_table), they
+    fill the empty columns of rows that name a 'route_name'. profile is a
+    cable_engine.Profile, the active one by default.
+    """
+    if profile is None:
+        profile = active_profile()
+
+    def field(key):
+        return (row.get(key) or '').strip()
+
+    out = dict(row)
+    for key in OUTPUT_COLUMNS:
+        out[key] = ''
+
+    try:
+        if routes is not None and field('route_name'):
+            values = routes.get(field('route_name'))
+            if values is None:
+                if not field('route'):
+                    raise ValueError(f"route '{field('route_name')}' not found")
+            else:
+                row = dict(row)
+                row.update((key, value) for key, value in values.items() if not field(key))
+                out.update((key, value) for key, value in row.items() if key in out)
+
+        category = row_category(row)
+        route = parse_number(field('route'))
+        otdr = field('otdr') or '0'
+
+        if category == 'cluster':
+            fdt = parse_number(field('slack_fdt'))
+            fat = parse_number(field('slack_fat'))
+            out['name'] = profile.cluster_cable_name(field('fdt'), field('line'),
+                                                     field('cable_type'), field('otdr'))
+            out['total_length'] = profile.total_length(route, fdt + fat)[1]
+            out['description'] = profile.cluster_description(route, fdt, fat, otdr)
+        elif category == 'feeder':
+            slack = parse_number(field('slack'))
+            out['name'] = profile.feeder_cable_name(field('olt'), field('fdt'),
+                                                    field('feeder_type'), field('cable_type'),
+                                                    field('otdr'))
+            out['total_length'] = profile.total_length(route, slack)[1]
+            out['description'] = profile.feeder_description(route, slack, otdr)
+        else:
+            raise ValueError(f"unknown category '{category}'")
+    except Exception as e:
+        for key in OUTPUT_COLUMNS:
+            out[key] = ''
+        out['error'] = str(e)
+
+    return out
+
+
+def process_rows(rows, routes=None, profile=None):
+    """Generator stage: input rows in, processed rows out"""
+    profile = profile or active_profile()
+    for row in rows:
+        yield process_row(row, routes, profile)
+
+
+def output_fieldnames(input_fieldnames):
+    """Input columns followed by the generated columns"""
+    fieldnames = list(input_fieldnames or [])
+    return fieldnames + [key for key in OUTPUT_COLUMNS if key not in fieldnames]
+
+
+@contextmanager
+def open_csv(path, mode):
+    """Open a CSV file, '-' means stdin/stdout"""
+    if path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+        return
+    encoding = 'utf-8-sig' if mode == 'r' else 'utf-8'
+    with open(path, mode, newline='', encoding=encoding) as f:
+        yield f
+
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic GC while bulk rows are read into memory
+
+    Rows of str values hold no reference cycles, but every million of them
+    allocated triggers collections that rescan all rows read so far; that
+    rescanning can cost more than the work done on the rows.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def iter_project(path):
+    """Rows of a batch CSV, or of a project store (.db)"""
+    if path.lower().endswith('.db'):
+        from cable_store import ProjectStore
+        with ProjectStore(path) as store:
+            yield from store
+        return
+    with open_csv(path, 'r') as src:
+        yield from csv.DictReader(src)
+
+
+def input_fraction(src):
+    """Fraction of an input file read so far, None for stdin"""
+    if src is sys.stdin:
+        return None
+    size = os.fstat(src.fileno()).st_size
+    return min(1.0, src.buffer.tell() / size) if size else 1.0
+
+
+def run_batch(input_path, output_path='-', routes=None, progress=None, otdr=None,
+              profile=None):
+    """Stream input CSV to output CSV row by row, return row count
+
+    An output path ending in .xlsx writes a streamed workbook instead (see
+    cable_export). progress(rows, fraction) is called every PROGRESS_ROWS
+    rows and once at the end; it may raise to stop the run. otdr is a trace
+    table (see cable_otdr.otdr_table) filling rows with an empty 'otdr'.
+    profile is the cable_engine.Profile to apply, the active one by default.
+    """
+    from cable_export import open_table
+    count = 0
+    with open_csv(input_path, 'r') as src:
+        reader = csv.DictReader(src)
+        rows = reader
+        if otdr is not None:
+            from cable_otdr import fill_otdr
+            rows = fill_otdr(reader, otdr)
+        with open_table(output_path, output_fieldnames(reader.fieldnames)) as writer:
+            for row in process_rows(rows, routes, profile):
+                writer.writerow(row)
+                count += 1
+                if progress and count % PROGRESS_ROWS == 0:
+                    progress(count, input_fraction(src))
+        if progress:
+            progress(count, 1.0)
+    return count
+
+
+def iter_route_table(routes_path, points_path=None, tolerance=None):
+    """Yield (route name, batch column values) for a KML/GeoJSON route file
+
+    Values always hold 'route'; with a points file, FDT/FAT points snapped
+    to the route also fill 'slack_fdt' and 'slack_fat'.
+    """
+    from cable_routes import BATCH_SIZE, iter_route_lengths, load_points, load_routes
+
+    grid = None
+    if points_path:
+        from cable_spatial import SNAP_TOLERANCE, PointGrid
+        grid = PointGrid((p for p in load_points(points_path) if p.kind),
+                         tolerance=tolerance or SNAP_TOLERANCE)
+
+    routes = load_routes(routes_path)
+    while True:
+        batch = list(islice(routes, BATCH_SIZE))
+        if not batch:
+            return
+        for route, (name, length) in zip(batch, iter_route_lengths(batch)):
+            values = {'route': str(round(length, 2))}
+            if grid is not None:
+                counts = grid.count_kinds(route.parts)
+                values['slack_fdt'] = str(counts['fdt'])
+                values['slack_fat'] = str(counts['fat'])
+            yield name, values
+
+
+def run_routes(routes_path, output_path='-', points_path=None, tolerance=None):
+    """Write the route table of a KML/GeoJSON file as CSV, return row count"""
+    columns = ['route', 'slack_fdt', 'slack_fat'] if points_path else ['route']
+    count = 0
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(['route_name'] + columns)
+        for name, values in iter_route_table(routes_path, points_path, tolerance):
+            writer.writerow([name] + [values[key] for key in columns])
+            count += 1
+    return count
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Duplicate Detection
+Finds repeated cable names and segments generated with different cable types
+"""
+
+import csv
+import heapq
+import os
+import tempfile
+from collections import namedtuple
+from itertools import groupby
+
+from cable_batch import iter_project, open_csv, row_category
+
+MAX_KEYS = 2_000_000  # distinct keys hashed in memory before spilling to sorted runs
+LISTED_ROWS = 20  # row numbers listed per finding, the count is always exact
+REPORT_COLUMNS = ['kind', 'key', 'count', 'values', 'rows']
+
+# kind is 'duplicate' (same name on several rows) or 'conflict' (same segment,
+# different cable types); rows are 1-based data rows
+Finding = namedtuple('Finding', ['kind', 'key', 'count', 'values', 'rows'])
+
+
+class Grouper:
+    """(key, row, value) entries grouped by key
+
+    Keys are hashed in a dict until more than max_keys distinct keys are
+    seen; then the dict and every later entry are written to sorted run
+    files and merged at the end, so memory stays bounded for any size.
+    """
+    def __init__(self, max_keys=MAX_KEYS, tmp_dir=None):
+        self.max_keys = max_keys
+        self.tmp_dir = tmp_dir
+        self.first = {}
+        self.repeats = {}
+        self.buffer = None
+        self.runs = []
+
+    def add(self, key, row, value=''):
+        if self.buffer is not None:
+            self.buffer.append((key, row, value))
+            if len(self.buffer) >= self.max_keys:
+                self._write_run(self.buffer)
+            return
+        entry = (row, value)
+        seen = self.first.setdefault(key, entry)
+        if seen is not entry:
+            repeats = self.repeats.get(key)
+            if repeats is None:
+                self.repeats[key] = [entry]
+            else:
+                repeats.append(entry)
+        elif len(self.first) > self.max_keys:
+            self._spill()
+
+    def _spill(self):
+        """Move the in-memory groups to the first run and switch to runs"""
+        entries = [(key, row, value) for key, (row, value) in self.first.items()]
+        entries.extend((key, row, value) for key, repeats in self.repeats.items()
+                       for row, value in repeats)
+        self.first.clear()
+        self.repeats.clear()
+        self.buffer = []
+        self._write_run(entries)
+
+    def _write_run(self, entries):
+        entries.sort()
+        fd, path = tempfile.mkstemp(prefix='cablegen-run-', suffix='.csv', dir=self.tmp_dir)
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(entries)
+        self.runs.append(path)
+        entries.clear()
+
+    def _merged(self, files):
+        """Sorted (key, row, value) entries of every run"""
+        readers = [((key, int(row), value) for key, row, value in csv.reader(f))
+                   for f in files]
+        return heapq.merge(*readers)
+
+    def groups(self):
+        """Yield (key, [(row, value), ...]) of keys seen more than once, by key"""
+        if self.buffer is None:
+            for key in sorted(self.repeats):
+                yield key, [self.first[key]] + self.repeats[key]
+            return
+
+        if self.buffer:
+            self._write_run(self.buffer)
+        files = [open(path, newline='', encoding='utf-8') for path in self.runs]
+        try:
+            for key, entries in groupby(self._merged(files), key=lambda entry: entry[0]):
+                first = next(entries)
+                rest = [(row, value) for _, row, value in entries]
+                if rest:
+                    yield key, [first[1:]] + rest
+        finally:
+            for f in files:
+                f.close()
+
+    def close(self):
+        """Remove the run files"""
+        for path in self.runs:
+            os.remove(path)
+        self.runs = []
+
+
+def segment_key(row):
+    """Segment a row's cable belongs to: cluster FDT/line, feeder OLT/FDT"""
+    fdt = (row.get('fdt') or '').strip().upper()
+    if not fdt:
+        return ''
+    category = row_category(row)
+    if category == 'cluster':
+        return f"cluster {fdt}/{(row.get('line') or '').strip().upper()}"
+    if category == 'feeder':
+        return f"feeder {(row.get('olt') or '').strip().upper()}/{fdt}"
+    return ''
+
+
+def _finding(kind, key, entries, distinct):
+    values = list(dict.fromkeys(value for _, value in entries if value))
+    if distinct and len(values) < 2:
+        return None
+    rows = [row for row, _ in entries]
+    return Finding(kind, key, len(rows), values, rows[:LISTED_ROWS])
+
+
+def find_duplicates(rows, max_keys=MAX_KEYS, tmp_dir=None):
+    """Yield the duplicate names, then the conflicting segments, of generated rows
+
+    Rows with an 'error' are skipped. The rows are read once; findings of
+    each kind come ordered by key.
+    """
+    names = Grouper(max_keys, tmp_dir)
+    segments = Grouper(max_keys, tmp_dir)
+    add_name, add_segment = names.add, segments.add
+    try:
+        for number, row in enumerate(rows, 1):
+            if row.get('error'):
+                continue
+            segment = segment_key(row)
+            name = row.get('name')
+            if name:
+                add_name(name.strip().upper(), number, segment)
+            if segment:
+                add_segment(segment, number, (row.get('cable_type') or '').strip().upper())
+
+        for kind, grouper, distinct in (('duplicate', names, False),
+                                        ('conflict', segments, True)):
+            for key, entries in grouper.groups():
+                finding = _finding(kind, key, entries, distinct)
+                if finding:
+                    yield finding
+    finally:
+        names.close()
+        segments.close()
+
+
+def run_duplicates(input_path, output_path='-', max_keys=MAX_KEYS):
+    """Write the findings of a project as CSV, return the number of findings"""
+    count = 0
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(REPORT_COLUMNS)
+        for finding in find_duplicates(iter_project(input_path), max_keys):
+            count += 1
+            rows = ' '.join(map(str, finding.rows))
+            if finding.count > len(finding.rows):
+                rows += ' ...'
+            writer.writerow([finding.kind, finding.key, finding.count,
+                             '; '.join(finding.values), rows])
+    return count
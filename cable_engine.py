@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Calculation Engine
+GUI-free naming and length math shared by the tabs and batch tools
+"""
+
+import math
+import string
+from itertools import repeat
+
+# NumPy is optional and imported on the first batch call, so importing the
+# engine for single names stays cheap; batch functions fall back to lists
+np = None
+_numpy_checked = False
+
+FEEDER_TYPES = ['SUBFEEDER', 'HUBFEEDER', 'MAINFEEDER']
+CLUSTER_CABLE_TYPES = ['24C/2T', '36C/3T', '48C/4T']
+FEEDER_CABLE_TYPES = ['24C/2T', '48C/4T', '96C/8T', '144C/12T', '288C/24T']
+
+# Rule profile defaults; a profile only needs the keys it changes. Names are
+# upper-cased after formatting, lengths are rounded to whole meters.
+DEFAULT_PROFILE = {
+    'slack_length': 20,  # meters per slack unit
+    'tolerance': 5,      # percent added to route + slack
+    'rounding': 'up',    # up, nearest or down
+    'cluster_name': '{fdt} - CABLE LINE {line} (FO {cable_type}) - AE - {length} M',
+    'feeder_name': '{olt} - {fdt} ({feeder_type} CABLE FO {cable_type}) - AE - {length} M',
+    'feeder_types': FEEDER_TYPES,
+    'cluster_cable_types': CLUSTER_CABLE_TYPES,
+    'feeder_cable_types': FEEDER_CABLE_TYPES,
+}
+# Fields a name template may use, in argument order
+NAME_FIELDS = {
+    'cluster_name': ('fdt', 'line', 'cable_type', 'length'),
+    'feeder_name': ('olt', 'fdt', 'feeder_type', 'cable_type', 'length'),
+}
+
+
+def parse_number(text):
+    """Parse numeric input text, empty counts as zero"""
+    return float(text or 0)
+
+
+def parse_cable_type(cable_type):
+    """Split a cable type like '48C/4T' into (cores, tubes)"""
+    cores, _, tubes = cable_type.strip().upper().partition('/')
+    if not (cores.endswith('C') and tubes.endswith('T')):
+        raise ValueError(f"invalid cable type '{cable_type}'")
+    cores, tubes = int(cores[:-1]), int(tubes[:-1])
+    if cores <= 0 or tubes <= 0 or cores % tubes:
+        raise ValueError(f"invalid cable type '{cable_type}'")
+    return cores, tubes
+
+
+def _round_half_up(value):
+    return math.floor(value + 0.5)
+
+
+ROUNDING = {'up': math.ceil, 'nearest': _round_half_up, 'down': math.floor}
+
+
+def _whole(value, key):
+    """Non-negative number of a profile key, int when it is whole (keeps '20' text)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"profile {key} must be a number") from None
+    if not 0 <= number < math.inf:
+        raise ValueError(f"profile {key} must be a number >= 0")
+    return int(number) if number.is_integer() else number
+
+
+def _choices(value, key, cable_types=False):
+    """Upper-case list of a profile key, cable types are checked"""
+    if not isinstance(value, (list, tuple)) or not value:
+        raise ValueError(f"profile {key} must be a non-empty list")
+    choices = [str(choice).strip().upper() for choice in value]
+    if cable_types:
+        for choice in choices:
+            parse_cable_type(choice)
+    return choices
+
+
+def compile_name(key, template):
+    """Name function of a template like DEFAULT_PROFILE['cluster_name']
+
+    The template becomes one f-string lambda, as fast as a hand-written
+    one. Only the NAME_FIELDS of key may appear, without format specs or
+    conversions, so the compiled code holds nothing but string literals
+    and those arguments.
+    """
+    fields = NAME_FIELDS[key]
+    parts = []
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"profile {key}: {e}") from None
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append(repr(literal))
+        if field is None:
+            continue
+        if field not in fields:
+            allowed = ', '.join('{%s}' % name for name in fields)
+            raise ValueError(f"profile {key}: unknown field '{{{field}}}', use {allowed}")
+        if spec or conversion:
+            raise ValueError(f"profile {key}: '{{{field}}}' takes no format spec or conversion")
+        parts.append(f"f'{{{field}}}'")
+    source = f"lambda {', '.join(fields)}: ({' '.join(parts) or repr('')}).upper()"
+    return eval(compile(source, f'<profile {key}>', 'eval'), {'__builtins__': {}})
+
+
+class Profile:
+    """Naming and length rules compiled once from a dict (see DEFAULT_PROFILE)
+
+    rules only needs the keys it changes. Names, lengths and descriptions
+    are closures over the compiled values, so a call does no rule lookups
+    and switching profiles is swapping one object.
+    """
+    def __init__(self, rules=None):
+        if rules is not None and not isinstance(rules, dict):
+            raise ValueError("profile must be an object of rules")
+        self.rules = dict(DEFAULT_PROFILE)
+        for key, value in (rules or {}).items():
+            if key not in DEFAULT_PROFILE:
+                raise ValueError(f"unknown profile key '{key}'")
+            self.rules[key] = value
+
+        self.slack_length = slack_length = _whole(self.rules['slack_length'], 'slack_length')
+        self.tolerance = _whole(self.rules['tolerance'], 'tolerance')
+        self.factor = factor = 1 + self.tolerance / 100
+        self.rounding = self.rules['rounding']
+        if not isinstance(self.rounding, str) or self.rounding not in ROUNDING:
+            raise ValueError(f"profile rounding must be one of {', '.join(ROUNDING)}")
+        round_length = ROUNDING[self.rounding]
+        self.feeder_types = _choices(self.rules['feeder_types'], 'feeder_types')
+        self.cluster_cable_types = _choices(self.rules['cluster_cable_types'],
+                                            'cluster_cable_types', True)
+        self.feeder_cable_types = _choices(self.rules['feeder_cable_types'],
+                                           'feeder_cable_types', True)
+        self.cable_types = sorted(set(self.cluster_cable_types + self.feeder_cable_types))
+        self.cluster_cable_name = compile_name('cluster_name', self.rules['cluster_name'])
+        self.feeder_cable_name = compile_name('feeder_name', self.rules['feeder_name'])
+
+        tolerance = f"{self.tolerance:g}%"
+
+        def total_length(route, slack_units):
+            """Return (route + slack, total length with tolerance) for one segment"""
+            route_plus_slack = route + (slack_units * slack_length)
+            return route_plus_slack, round_length(route_plus_slack * factor)
+
+        def cluster_description(route, fdt, fat, otdr='0'):
+            """Cluster cable description for one segment"""
+            total_slack = fdt + fat
+            route_plus_slack, length = total_length(route, total_slack)
+
+            result = f"""Total Route : {route} m
+Total Slack : {total_slack} unit ({fdt} slack FDT & {fat} slack FAT) @{slack_length} m
+Toleransi : {tolerance}
+Total Length Cable : {route} + {total_slack * slack_length} = {route_plus_slack} m + ({route_plus_slack} m x {tolerance}) = {length} m
+By OTDR : {otdr} m"""
+
+            return result.upper()
+
+        def feeder_description(route, slack, otdr='0'):
+            """Feeder cable description for one segment"""
+            route_plus_slack, length = total_length(route, slack)
+
+            result = f"""Total Route : {route} m
+Total Slack : {slack} unit @{slack_length} m
+Toleransi : {tolerance}
+Total Length Cable : {route} + {slack * slack_length} = {route_plus_slack} m + ({route_plus_slack} m x {tolerance}) = {length} m
+By OTDR : {otdr} m"""
+
+            return result.upper()
+
+        self.total_length = total_length
+        self.cluster_description = cluster_description
+        self.feeder_description = feeder_description
+
+    def total_lengths(self, route, slack_units):
+        """Vectorized total length over route and slack columns"""
+        if numpy_module() is not None:
+            route = np.asarray(route, dtype=np.float64)
+            slack_units = np.asarray(slack_units, dtype=np.float64)
+            route_plus_slack = (route + (slack_units * self.slack_length)) * self.factor
+            if self.rounding == 'nearest':
+                return np.floor(route_plus_slack + 0.5).astype(np.int64)
+            rounded = np.ceil if self.rounding == 'up' else np.floor
+            return rounded(route_plus_slack).astype(np.int64)
+
+        total_length = self.total_length
+        return [total_length(float(r), float(s))[1] for r, s in zip(route, slack_units)]
+
+
+_profile = Profile()
+
+
+def active_profile():
+    """Profile used by the module-level naming and length functions"""
+    return _profile
+
+
+def use_profile(profile=None):
+    """Make a Profile (or a rules dict, None for the defaults) active, return it"""
+    global _profile
+    _profile = profile if isinstance(profile, Profile) else Profile(profile)
+    return _profile
+
+
+def load_profile(path):
+    """Profile from a JSON rules file"""
+    import json
+    with open(path, encoding='utf-8') as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict):
+        raise ValueError("profile must be an object of rules")
+    return Profile(rules)
+
+
+def cluster_cable_name(fdt, line, cable_type, length):
+    """Cluster cable name"""
+    return _profile.cluster_cable_name(fdt, line, cable_type, length)
+
+
+def feeder_cable_name(olt, fdt, feeder_type, cable_type, length):
+    """Feeder cable name"""
+    return _profile.feeder_cable_name(olt, fdt, feeder_type, cable_type, length)
+
+
+def total_length(route, slack_units):
+    """Return (route + slack, total length with tolerance) for one segment"""
+    return _profile.total_length(route, slack_units)
+
+
+def cluster_description(route, fdt, fat, otdr='0'):
+    """Cluster cable description for one segment"""
+    return _profile.cluster_description(route, fdt, fat, otdr)
+
+
+def feeder_description(route, slack, otdr='0'):
+    """Feeder cable description for one segment"""
+    return _profile.feeder_description(route, slack, otdr)
+
+
+def numpy_module():
+    """numpy module, None if it is not installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+
+def _floats(values):
+    """Column as a list of Python floats (keeps str() output identical)"""
+    if numpy_module() is not None and isinstance(values, np.ndarray):
+        return values.astype(np.float64).tolist()
+    return [float(v) for v in values]
+
+
+def _otdr_texts(otdr):
+    """OTDR column as display strings, empty counts as '0'"""
+    if otdr is None:
+        return repeat('0')
+    return (str(o) if o not in (None, '') else '0' for o in otdr)
+
+
+def total_lengths(route, slack_units):
+    """Vectorized total length over route and slack columns"""
+    return _profile.total_lengths(route, slack_units)
+
+
+def cluster_lengths(route, fdt, fat):
+    """Vectorized cluster total length, slack = FDT + FAT units"""
+    if numpy_module() is not None:
+        slack = np.asarray(fdt, dtype=np.float64) + np.asarray(fat, dtype=np.float64)
+        return total_lengths(route, slack)
+    return total_lengths(route, [float(a) + float(b) for a, b in zip(fdt, fat)])
+
+
+def feeder_lengths(route, slack):
+    """Vectorized feeder total length"""
+    return total_lengths(route, slack)
+
+
+def cluster_batch(route, fdt, fat, otdr=None):
+    """Return (total lengths, descriptions) for cluster columns"""
+    descriptions = [
+        cluster_description(r, a, b, o)
+        for r, a, b, o in zip(_floats(route), _floats(fdt), _floats(fat), _otdr_texts(otdr))
+    ]
+    return cluster_lengths(route, fdt, fat), descriptions
+
+
+def feeder_batch(route, slack, otdr=None):
+    """Return (total lengths, descriptions) for feeder columns"""
+    descriptions = [
+        feeder_description(r, s, o)
+        for r, s, o in zip(_floats(route), _floats(slack), _otdr_texts(otdr))
+    ]
+    return feeder_lengths(route, slack), descriptions
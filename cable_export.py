@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Export
+Streams result rows to CSV or XLSX in chunks, memory stays flat for any row count
+"""
+
+import csv
+import re
+import zipfile
+from contextlib import contextmanager
+from xml.sax.saxutils import escape
+
+from cable_batch import open_csv
+
+CHUNK_ROWS = 1000  # rows buffered between writes
+XLSX_MAX_ROWS = 1048576  # Excel sheet limit, header included
+NUMERIC_COLUMNS = {'route', 'total_length', 'otdr', 'slack_fdt', 'slack_fat', 'slack'}
+
+_NUMBER = re.compile(r'-?(0|[1-9]\d*)(\.\d+)?\Z')
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_SPECIAL_XML = re.compile('[&<>\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}</Types>')
+_SHEET_TYPE = ('<Override PartName="/xl/worksheets/sheet{n}.xml" '
+               'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>')
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>')
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}<Relationship Id="rIdStyles" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>')
+_SHEET_REL = ('<Relationship Id="rId{n}" '
+              'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+              'Target="worksheets/sheet{n}.xml"/>')
+# Style 1 = bold header, style 2 = wrapped text for multi-line descriptions
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">'
+    '<alignment wrapText="1" vertical="top"/></xf></cellXfs>'
+    '</styleSheet>')
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>')
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def column_letter(index):
+    """Spreadsheet column letters of a 0-based index (0 -> A, 26 -> AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _xml_text(value):
+    if _SPECIAL_XML.search(value) is None:
+        return value
+    return escape(_ILLEGAL_XML.sub('', value))
+
+
+class XlsxWriter:
+    """Write-only XLSX workbook, rows are streamed into the zip as they come
+
+    Strings are written inline (no shared string table) so nothing grows
+    with the row count; a sheet that reaches the Excel row limit is closed
+    and continued on a new sheet with the same header.
+    """
+    def __init__(self, path, fieldnames, sheet_name='Cables'):
+        self.fieldnames = list(fieldnames)
+        self.sheet_name = sheet_name
+        self.zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self.refs = [column_letter(i) for i in range(len(self.fieldnames))]
+        self.columns = [(ref, key, key in NUMERIC_COLUMNS)
+                        for ref, key in zip(self.refs, self.fieldnames)]
+        self.sheets = 0
+        self.sheet = None
+        self.rows = 0
+        self.buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _cells(self, row, n):
+        """XML of one row's cells, empty values are left out"""
+        cells = []
+        for ref, key, numeric in self.columns:
+            value = row.get(key)
+            if value is None or value == '':
+                continue
+            if value.__class__ is not str:
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    cells.append(f'<c r="{ref}{n}"><v>{value}</v></c>')
+                    continue
+                value = str(value)
+            if numeric and _NUMBER.match(value):
+                cells.append(f'<c r="{ref}{n}"><v>{value}</v></c>')
+            elif '\n' in value:
+                cells.append(f'<c r="{ref}{n}" t="inlineStr" s="2"><is>'
+                             f'<t xml:space="preserve">{_xml_text(value)}</t></is></c>')
+            else:
+                cells.append(f'<c r="{ref}{n}" t="inlineStr"><is>'
+                             f'<t xml:space="preserve">{_xml_text(value)}</t></is></c>')
+        return ''.join(cells)
+
+    def _new_sheet(self):
+        self._close_sheet()
+        self.sheets += 1
+        self.sheet = self.zip.open(f'xl/worksheets/sheet{self.sheets}.xml', 'w',
+                                   force_zip64=True)
+        self.sheet.write(_SHEET_START.encode('utf-8'))
+        self.rows = 1
+        cells = ''.join(f'<c r="{ref}1" t="inlineStr" s="1"><is><t>{_xml_text(key)}</t></is></c>'
+                        for ref, key in zip(self.refs, self.fieldnames))
+        self.buffer.append(f'<row r="1">{cells}</row>')
+
+    def _flush(self):
+        if self.buffer:
+            self.sheet.write(''.join(self.buffer).encode('utf-8'))
+            self.buffer.clear()
+
+    def _close_sheet(self):
+        if self.sheet is not None:
+            self._flush()
+            self.sheet.write(_SHEET_END.encode('utf-8'))
+            self.sheet.close()
+            self.sheet = None
+
+    def writerow(self, row):
+        """Write a dict row, keys outside fieldnames are ignored"""
+        if self.sheet is None or self.rows >= XLSX_MAX_ROWS:
+            self._new_sheet()
+        self.rows += 1
+        n = self.rows
+        self.buffer.append(f'<row r="{n}">{self._cells(row, n)}</row>')
+        if len(self.buffer) >= CHUNK_ROWS:
+            self._flush()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        """Finish the last sheet and write the workbook parts"""
+        if self.zip is None:
+            return
+        if self.sheet is None and not self.sheets:
+            self._new_sheet()
+        self._close_sheet()
+        n = range(1, self.sheets + 1)
+        names = [self.sheet_name if i == 1 else f"{self.sheet_name} {i}" for i in n]
+        self.zip.writestr('[Content_Types].xml', _CONTENT_TYPES.format(
+            sheets=''.join(_SHEET_TYPE.format(n=i) for i in n)))
+        self.zip.writestr('_rels/.rels', _ROOT_RELS)
+        self.zip.writestr('xl/workbook.xml', _WORKBOOK.format(sheets=''.join(
+            f'<sheet name="{_xml_text(name)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in zip(n, names))))
+        self.zip.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS.format(
+            sheets=''.join(_SHEET_REL.format(n=i) for i in n)))
+        self.zip.writestr('xl/styles.xml', _STYLES)
+        self.zip.close()
+        self.zip = None
+
+
+def is_xlsx(path):
+    return path != '-' and path.lower().endswith('.xlsx')
+
+
+@contextmanager
+def open_table(path, fieldnames):
+    """Row writer for path: XLSX by extension, CSV otherwise ('-' = stdout)
+
+    The writer takes dict rows through writerow(); the header is written.
+    """
+    if is_xlsx(path):
+        with XlsxWriter(path, fieldnames) as writer:
+            yield writer
+        return
+    with open_csv(path, 'w') as dst:
+        writer = csv.DictWriter(dst, fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        yield writer
+
+
+def export_rows(rows, path, fieldnames):
+    """Stream dict rows to a CSV/XLSX file, return row count"""
+    count = 0
+    with open_table(path, fieldnames) as writer:
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def convert_csv(input_path, output_path):
+    """Stream a CSV file into a CSV/XLSX file, return row count"""
+    with open_csv(input_path, 'r') as src:
+        reader = csv.DictReader(src)
+        return export_rows(reader, output_path, reader.fieldnames or [])
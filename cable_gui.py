@@ -0,0 +1,1292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - GUI
+Tkinter application converted from the Figma design
+"""
+
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from cable_engine import active_profile, parse_number
+from cable_instrument import INSTRUMENTS, timed
+from cable_validation import Validator
+
+LIVE_DELAY_MS = 150  # typing pause before live regeneration
+
+# Field names used by the validator, as labelled in the panels
+FIELD_LABELS = {
+    'olt': 'OLT Code', 'fdt': 'FDT Code', 'line': 'Line Code',
+    'feeder_type': 'Feeder Type', 'cable_type': 'Cable Type', 'route': 'Route',
+    'slack_fdt': 'Slack FDT', 'slack_fat': 'Slack FAT', 'slack': 'Slack', 'otdr': 'OTDR',
+}
+
+# Windows taskbar icon support
+try:
+    from ctypes import windll
+    myappid = 'emr.cablegenerator.tools.1.0'
+    windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+except:
+    pass
+
+
+class ModernButton(tk.Canvas):
+    """Custom button widget with modern styling"""
+    def __init__(self, parent, text, command, bg_color, hover_color, **kwargs):
+        super().__init__(parent, highlightthickness=0, **kwargs)
+        self.bg_color = bg_color
+        self.hover_color = hover_color
+        self.command = command
+        self.text = text
+        
+        self.configure(bg=bg_color, height=35)
+        self.text_id = self.create_text(
+            0, 0, text=text, fill='white', 
+            font=('Segoe UI', 9, 'bold'), anchor='center'
+        )
+        
+        self.bind('<Button-1>', lambda e: command())
+        self.bind('<Enter>', self._on_enter)
+        self.bind('<Leave>', self._on_leave)
+        self.bind('<Configure>', self._on_configure)
+    
+    def _on_configure(self, event):
+        self.coords(self.text_id, event.width // 2, event.height // 2)
+    
+    def _on_enter(self, event):
+        self.configure(bg=self.hover_color)
+    
+    def _on_leave(self, event):
+        self.configure(bg=self.bg_color)
+
+
+class VirtualTable(tk.Frame):
+    """Treeview that shows a window of a ResultView instead of one item per row
+    
+    The tree holds a fixed number of items whose values are swapped on
+    scroll, so scrolling, sorting and filtering cost the same at 500k rows
+    as at 50.
+    """
+    headings = {'name': 'Name', 'cable_type': 'Cable Type',
+                'total_length': 'Total Length (m)', 'otdr': 'OTDR (m)'}
+    widths = {'name': 260, 'cable_type': 80, 'total_length': 100, 'otdr': 70}
+    
+    def __init__(self, parent, columns, visible_rows=16, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columns = columns
+        self.visible_rows = visible_rows
+        self.view = None
+        self.top = 0
+        
+        self.tree = ttk.Treeview(self, columns=columns, show='headings',
+                                 height=visible_rows, selectmode='browse',
+                                 style='Results.Treeview')
+        for column in columns:
+            self.tree.heading(column, text=self.headings[column],
+                              command=lambda c=column: self.sort(c))
+            self.tree.column(column, width=self.widths[column],
+                             stretch=(column == 'name'), anchor='w')
+        self.items = [self.tree.insert('', tk.END, values=()) for _ in range(visible_rows)]
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        
+        for widget in (self.tree, self.scrollbar):
+            widget.bind('<MouseWheel>', self._on_wheel)
+            widget.bind('<Button-4>', lambda e: self.scroll_to(self.top - 3))
+            widget.bind('<Button-5>', lambda e: self.scroll_to(self.top + 3))
+        self.tree.bind('<Up>', lambda e: self.scroll_to(self.top - 1) or 'break')
+        self.tree.bind('<Down>', lambda e: self.scroll_to(self.top + 1) or 'break')
+        self.tree.bind('<Prior>', lambda e: self.scroll_to(self.top - self.visible_rows) or 'break')
+        self.tree.bind('<Next>', lambda e: self.scroll_to(self.top + self.visible_rows) or 'break')
+    
+    def set_view(self, view):
+        self.view = view
+        self.top = 0
+        self.refresh()
+    
+    def refresh(self):
+        """Copy the visible window of the view into the fixed tree items"""
+        selection = self.tree.selection()
+        if selection:
+            self.tree.selection_remove(*selection)
+        count = len(self.view) if self.view is not None else 0
+        self.top = max(0, min(self.top, count - self.visible_rows))
+        rows = self.view.window(self.top, self.visible_rows) if count else []
+        for i, item in enumerate(self.items):
+            self.tree.item(item, values=rows[i] if i < len(rows) else ())
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + self.visible_rows) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def scroll_to(self, top):
+        self.top = top
+        self.refresh()
+    
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, units|pages)"""
+        count = len(self.view) if self.view is not None else 0
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * count))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll_to(self.top + int(args[1]) * step)
+    
+    def _on_wheel(self, event):
+        self.scroll_to(self.top - 3 * (1 if event.delta > 0 else -1))
+    
+    def sort(self, column):
+        """Sort by a column, clicking the same heading again reverses it"""
+        if self.view is None:
+            return
+        reverse = self.view.sort_column == column and not self.view.reverse
+        self.view.sort(column, reverse)
+        for c in self.columns:
+            arrow = (' \u25bc' if reverse else ' \u25b2') if c == column else ''
+            self.tree.heading(c, text=self.headings[c] + arrow)
+        self.scroll_to(0)
+    
+    def filter(self, text):
+        if self.view is not None:
+            self.view.filter(text)
+            self.scroll_to(0)
+    
+    def selected_row(self):
+        """Values of the selected row, None without a selection"""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        values = self.tree.item(selection[0], 'values')
+        return values or None
+
+
+class CableGeneratorApp:
+    def __init__(self, root, store_path=None, validator=None, profile=None):
+        self.root = root
+        self.root.title("EMR Cable Generator Tools")
+        self.root.geometry("1000x750")
+        self.root.resizable(False, False)
+        
+        # Set window icon once the window is shown
+        self.root.after_idle(self.load_icon)
+        
+        # Center window on screen
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        window_width = 1000
+        window_height = 750
+        x = (screen_width - window_width) // 2
+        y = (screen_height - window_height) // 2
+        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        
+        # Figma Color Palette
+        self.colors = {
+            'bg_main': '#2d3e50',
+            'bg_section': '#3a4f63',
+            'bg_input': '#4a5f73',
+            'border': '#5a6f83',
+            'title_bar': '#0066cc',
+            'title_bar_hover': '#0052a3',
+            'output_bg': '#1a2f1a',
+            'output_border': '#2d4a2d',
+            'output_text': '#4ade80',
+            'text_primary': '#ffffff',
+            'text_secondary': '#d1d5db',
+            'text_label': '#9ca3af',
+            'button_blue': '#0066cc',
+            'button_blue_hover': '#0052a3',
+            'button_gray': '#4a5f73',
+            'button_gray_hover': '#5a6f83',
+            'button_green': '#28a745',
+            'button_green_hover': '#218838',
+            'gradient_start': '#3a4f63',
+            'gradient_end': '#2d3e50',
+            'error': '#f87171',
+        }
+        
+        self.root.configure(bg=self.colors['bg_main'])
+        
+        # Main container
+        main_container = tk.Frame(root, bg=self.colors['bg_main'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        
+        # Header (no title bar)
+        header = tk.Frame(main_container, bg=self.colors['gradient_start'], height=80)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(header, text="EMR Cable Generator Tools",
+                              bg=self.colors['gradient_start'], fg=self.colors['text_primary'],
+                              font=('Segoe UI', 18, 'bold'))
+        title_label.pack(expand=True)
+        
+        # Live generation toggle
+        self.live_mode = tk.BooleanVar(value=False)
+        self.live_jobs = {}
+        self.live_button = tk.Label(header, font=('Segoe UI', 8, 'bold'),
+                                   padx=10, pady=4, cursor='hand2')
+        self.live_button.place(relx=1.0, rely=0.5, x=-16, anchor='e')
+        self.live_button.bind('<Button-1>', lambda e: self.toggle_live())
+        self.update_live_button()
+        
+        # Tab Navigation
+        tab_frame = tk.Frame(main_container, bg=self.colors['bg_main'])
+        tab_frame.pack(fill=tk.X, padx=16, pady=(16, 0))
+        
+        # Center container for tabs
+        tab_center = tk.Frame(tab_frame, bg=self.colors['bg_main'])
+        tab_center.pack(expand=True)
+        
+        self.active_tab = 'cable'
+        self.tab_buttons = {}
+        
+        tabs = [
+            ('cable', 'Cable Generator'),
+            ('ci', 'Cluster Description Generator'),
+            ('feeder', 'Feeder Description Generator'),
+            ('batch', 'Batch Processing')
+        ]
+        
+        for tab_id, tab_name in tabs:
+            btn = tk.Label(tab_center, text=tab_name, 
+                          font=('Segoe UI', 9),
+                          padx=24, pady=8, cursor='hand2')
+            btn.pack(side=tk.LEFT, padx=(0, 8))
+            btn.bind('<Button-1>', lambda e, t=tab_id: self.switch_tab(t))
+            self.tab_buttons[tab_id] = btn
+        
+        # Content area
+        self.content_frame = tk.Frame(main_container, bg=self.colors['bg_main'])
+        self.content_frame.pack(fill=tk.BOTH, expand=True, padx=16, pady=16)
+        
+        # Tab panels are built on the first switch to them
+        self.panels = {}
+        self.panel_builders = {
+            'cable': self.create_cable_panel,
+            'ci': self.create_ci_panel,
+            'feeder': self.create_feeder_panel,
+            'batch': self.create_batch_panel,
+        }
+        self.timings = {}
+        # Rule profile: names, lengths, descriptions and the combobox choices
+        self.profile = profile or active_profile()
+        self.validator = validator or Validator(profile=self.profile)
+        
+        # Project store given with --store, opened on the first generated result
+        self.store_path = store_path
+        self.store = None
+        
+        # Show initial tab
+        self.switch_tab('cable')
+        
+        # Hidden diagnostics view
+        self.diagnostics = None
+        self.root.bind('<F12>', lambda e: self.show_diagnostics())
+        self.root.bind('<Control-D>', lambda e: self.show_diagnostics())
+    
+    def load_icon(self):
+        """Set window icon"""
+        try:
+            self.root.iconbitmap('app.ico')
+        except:
+            pass
+    
+    def report_startup_timing(self, start_time, imports_done):
+        """Print startup milestones once the first frame is drawn, then exit"""
+        window_done = time.perf_counter()
+        
+        def on_map(event):
+            if event.widget is self.root:
+                self.root.unbind('<Map>')
+                self.root.after_idle(report)
+        
+        def report():
+            self.root.update_idletasks()
+            first_frame = time.perf_counter()
+            for label, moment in [('imports', imports_done), ('window', window_done),
+                                  ('first frame', first_frame)]:
+                print(f"{label:>16}: {(moment - start_time) * 1000:8.1f} ms", file=sys.stderr)
+            for label, seconds in self.timings.items():
+                print(f"{label:>16}: {seconds * 1000:8.1f} ms (build)", file=sys.stderr)
+            self.root.destroy()
+        
+        self.root.bind('<Map>', on_map)
+    
+    def update_live_button(self):
+        """Update live toggle text and colors"""
+        if self.live_mode.get():
+            self.live_button.configure(text="LIVE: ON", bg=self.colors['button_green'], fg='white')
+        else:
+            self.live_button.configure(text="LIVE: OFF", bg=self.colors['bg_input'],
+                                       fg=self.colors['text_secondary'])
+    
+    def toggle_live(self):
+        """Toggle live generation, regenerating the active tab when enabled"""
+        self.live_mode.set(not self.live_mode.get())
+        self.update_live_button()
+        generate = self.tab_generators().get(self.active_tab)
+        if generate and self.live_mode.get():
+            self.schedule_live(generate)
+    
+    def tab_generators(self):
+        return {'cable': self.generate_cable, 'ci': self.generate_ci,
+                'feeder': self.generate_feeder}
+    
+    def bind_live(self, widgets, generate):
+        """Regenerate through schedule_live when the widgets change"""
+        for widget in widgets:
+            widget.bind('<KeyRelease>', lambda e: self.schedule_live(generate), add='+')
+            widget.bind('<<ComboboxSelected>>', lambda e: self.schedule_live(generate), add='+')
+    
+    def schedule_live(self, generate):
+        """Debounce live regeneration: run generate once typing pauses"""
+        if not self.live_mode.get():
+            return
+        job = self.live_jobs.pop(generate.__name__, None)
+        if job:
+            self.root.after_cancel(job)
+        # Live results are previews, only GENERATE saves to the project store
+        self.live_jobs[generate.__name__] = self.root.after(LIVE_DELAY_MS,
+                                                            lambda: generate(save=False))
+    
+    def create_title_bar(self, parent):
+        """Create custom title bar"""
+        title_bar = tk.Frame(parent, bg=self.colors['title_bar'], height=32)
+        title_bar.pack(fill=tk.X)
+        title_bar.pack_propagate(False)
+        
+        # Icon and title
+        left_frame = tk.Frame(title_bar, bg=self.colors['title_bar'])
+        left_frame.pack(side=tk.LEFT, padx=12, pady=6)
+        
+        icon_box = tk.Frame(left_frame, bg='#4d7fbf', width=16, height=16)
+        icon_box.pack(side=tk.LEFT, padx=(0, 8))
+        
+        tk.Label(left_frame, text="EMR Cable Generator Tools",
+                bg=self.colors['title_bar'], fg='white',
+                font=('Segoe UI', 9)).pack(side=tk.LEFT)
+        
+        # Window controls (minimize, maximize, close)
+        controls = tk.Frame(title_bar, bg=self.colors['title_bar'])
+        controls.pack(side=tk.RIGHT, padx=4, pady=4)
+        
+        for symbol in ['−', '□', '×']:
+            btn = tk.Label(controls, text=symbol, bg=self.colors['title_bar'],
+                          fg='white', width=3, height=1, font=('Segoe UI', 10))
+            btn.pack(side=tk.LEFT, padx=1)
+            if symbol == '×':
+                btn.bind('<Button-1>', lambda e: self.root.quit())
+                btn.bind('<Enter>', lambda e: e.widget.configure(bg='#dc3545'))
+                btn.bind('<Leave>', lambda e: e.widget.configure(bg=self.colors['title_bar']))
+            else:
+                btn.bind('<Enter>', lambda e: e.widget.configure(bg=self.colors['title_bar_hover']))
+                btn.bind('<Leave>', lambda e: e.widget.configure(bg=self.colors['title_bar']))
+    
+    @timed('switch tab')
+    def switch_tab(self, tab_id):
+        """Switch between tabs"""
+        self.active_tab = tab_id
+        
+        if tab_id not in self.panels:
+            start = time.perf_counter()
+            self.panels[tab_id] = self.panel_builders[tab_id]()
+            self.timings[f"{tab_id} panel"] = time.perf_counter() - start
+            INSTRUMENTS.record(f"build {tab_id} panel", self.timings[f"{tab_id} panel"])
+        
+        # Update tab button styles
+        for tid, btn in self.tab_buttons.items():
+            if tid == tab_id:
+                btn.configure(bg=self.colors['button_blue'], fg='white')
+            else:
+                btn.configure(bg=self.colors['bg_section'], fg=self.colors['text_secondary'])
+        
+        # Show/hide panels
+        for pid, panel in self.panels.items():
+            if pid == tab_id:
+                panel.pack(fill=tk.BOTH, expand=True)
+            else:
+                panel.pack_forget()
+    
+    def create_input_section(self, parent, title="Input Parameters"):
+        """Create styled input section"""
+        section = tk.Frame(parent, bg=self.colors['bg_section'], 
+                          highlightbackground=self.colors['border'],
+                          highlightthickness=1)
+        section.pack(fill=tk.BOTH, expand=True, padx=(0, 12))
+        
+        # Header
+        header = tk.Label(section, text=title, bg=self.colors['bg_section'],
+                         fg=self.colors['text_primary'], font=('Segoe UI', 9),
+                         anchor='w')
+        header.pack(fill=tk.X, padx=16, pady=(12, 8))
+        
+        separator = tk.Frame(section, bg=self.colors['border'], height=1)
+        separator.pack(fill=tk.X, padx=16, pady=(0, 12))
+        
+        # Input container
+        input_container = tk.Frame(section, bg=self.colors['bg_section'])
+        input_container.pack(fill=tk.BOTH, expand=True, padx=16, pady=(0, 32))
+        
+        return input_container
+    
+    def create_output_section(self, parent, title="Result Output", height=None):
+        """Create styled output section, a height in lines keeps it compact"""
+        section = tk.Frame(parent, bg=self.colors['bg_section'],
+                          highlightbackground=self.colors['border'],
+                          highlightthickness=1)
+        if height:
+            section.pack(fill=tk.X, pady=(0, 12))
+        else:
+            section.pack(fill=tk.BOTH, expand=True)
+        
+        # Header
+        header = tk.Label(section, text=title, bg=self.colors['bg_section'],
+                         fg=self.colors['text_primary'], font=('Segoe UI', 9),
+                         anchor='w')
+        header.pack(fill=tk.X, padx=16, pady=(12, 8))
+        
+        separator = tk.Frame(section, bg=self.colors['border'], height=1)
+        separator.pack(fill=tk.X, padx=16, pady=(0, 12))
+        
+        # Output text
+        output_text = tk.Text(section, bg=self.colors['output_bg'],
+                             fg=self.colors['output_text'],
+                             font=('Consolas', 9),
+                             highlightbackground=self.colors['output_border'],
+                             highlightthickness=1,
+                             relief=tk.FLAT,
+                             padx=16, pady=16,
+                             wrap=tk.WORD,
+                             state='disabled')
+        if height:
+            output_text.configure(height=height)
+            output_text.pack(fill=tk.X, padx=16, pady=(0, 16))
+        else:
+            output_text.pack(fill=tk.BOTH, expand=True, padx=16, pady=(0, 60))
+        
+        return output_text
+    
+    def create_table_section(self, parent, rows=12, export=None):
+        """Create styled results table with a name filter and optional export link"""
+        style = ttk.Style()
+        style.configure('Results.Treeview', background=self.colors['output_bg'],
+                       fieldbackground=self.colors['output_bg'],
+                       foreground=self.colors['output_text'],
+                       font=('Consolas', 9), rowheight=20)
+        style.configure('Results.Treeview.Heading', font=('Segoe UI', 9, 'bold'))
+        
+        section = tk.Frame(parent, bg=self.colors['bg_section'],
+                          highlightbackground=self.colors['border'],
+                          highlightthickness=1)
+        section.pack(fill=tk.BOTH, expand=True)
+        
+        # Header
+        header = tk.Label(section, text="Results", bg=self.colors['bg_section'],
+                         fg=self.colors['text_primary'], font=('Segoe UI', 9),
+                         anchor='w')
+        header.pack(fill=tk.X, padx=16, pady=(12, 8))
+        
+        if export:
+            link = tk.Label(header, text="Export CSV/XLSX...", bg=self.colors['bg_section'],
+                           fg=self.colors['text_secondary'], font=('Segoe UI', 8, 'underline'),
+                           cursor='hand2')
+            link.place(relx=1.0, rely=0.5, anchor='e')
+            link.bind('<Button-1>', lambda e: export())
+        
+        separator = tk.Frame(section, bg=self.colors['border'], height=1)
+        separator.pack(fill=tk.X, padx=16, pady=(0, 12))
+        
+        # Filter
+        filter_entry = tk.Entry(section, bg=self.colors['bg_input'],
+                               fg=self.colors['text_primary'],
+                               font=('Segoe UI', 9),
+                               relief=tk.FLAT,
+                               highlightbackground=self.colors['border'],
+                               highlightthickness=1,
+                               insertbackground=self.colors['text_primary'])
+        filter_entry.pack(fill=tk.X, padx=16, pady=(0, 8), ipady=4)
+        
+        table = VirtualTable(section, ('name', 'cable_type', 'total_length', 'otdr'),
+                             visible_rows=rows, bg=self.colors['bg_section'])
+        table.pack(fill=tk.BOTH, expand=True, padx=16, pady=(0, 16))
+        table.refresh()
+        
+        # Filter once typing pauses, a 500k-row scan should not run per key
+        filter_job = [None]
+        
+        def apply_filter():
+            filter_job[0] = None
+            table.filter(filter_entry.get())
+        
+        def on_key(event):
+            if filter_job[0]:
+                self.root.after_cancel(filter_job[0])
+            filter_job[0] = self.root.after(LIVE_DELAY_MS, apply_filter)
+        
+        filter_entry.bind('<KeyRelease>', on_key)
+        
+        return table
+    
+    def create_input_field(self, parent, label_text, row):
+        """Create styled input field"""
+        label = tk.Label(parent, text=label_text, bg=self.colors['bg_section'],
+                        fg=self.colors['text_primary'], font=('Segoe UI', 9),
+                        anchor='w')
+        label.grid(row=row, column=0, sticky='w', pady=(0, 12))
+        
+        entry = tk.Entry(parent, bg=self.colors['bg_input'],
+                        fg=self.colors['text_primary'],
+                        font=('Segoe UI', 9),
+                        relief=tk.FLAT,
+                        highlightbackground=self.colors['border'],
+                        highlightthickness=1,
+                        insertbackground=self.colors['text_primary'])
+        entry.grid(row=row+1, column=0, sticky='ew', pady=(0, 12), ipady=6)
+        
+        return entry
+    
+    def create_link(self, parent, text, row, command):
+        """Create clickable text on the right of a field label"""
+        link = tk.Label(parent, text=text, bg=self.colors['bg_section'],
+                       fg=self.colors['text_secondary'], font=('Segoe UI', 8, 'underline'),
+                       cursor='hand2')
+        link.grid(row=row, column=0, sticky='e', pady=(0, 12))
+        link.bind('<Button-1>', lambda e: command())
+        return link
+    
+    def create_cable_panel(self):
+        """Cable Generator Panel"""
+        panel = tk.Frame(self.content_frame, bg=self.colors['bg_main'])
+        
+        # Two column layout
+        left_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        right_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
+        
+        # Input section
+        input_container = self.create_input_section(left_col)
+        input_container.grid_columnconfigure(0, weight=1)
+        
+        # Cable Category
+        category_label = tk.Label(input_container, text="Cable Category:",
+                                 bg=self.colors['bg_section'],
+                                 fg=self.colors['text_label'],
+                                 font=('Segoe UI', 9), anchor='w')
+        category_label.grid(row=0, column=0, sticky='w', pady=(0, 8))
+        
+        category_frame = tk.Frame(input_container, bg=self.colors['bg_section'])
+        category_frame.grid(row=1, column=0, sticky='ew', pady=(0, 12))
+        
+        self.cable_category = tk.StringVar(value='cluster')
+        self.category_buttons = {}
+        
+        for value, text in [('cluster', 'Cluster Cable'), ('feeder', 'Feeder Cable')]:
+            btn = tk.Label(category_frame, text=text,
+                          font=('Segoe UI', 9),
+                          cursor='hand2',
+                          padx=16, pady=8)
+            btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+            btn.bind('<Button-1>', lambda e, v=value: self.select_cable_category(v))
+            self.category_buttons[value] = btn
+        
+        # Dynamic input fields
+        self.cable_inputs_frame = tk.Frame(input_container, bg=self.colors['bg_section'])
+        self.cable_inputs_frame.grid(row=2, column=0, sticky='ew')
+        self.cable_inputs_frame.grid_columnconfigure(0, weight=1)
+        
+        self.cable_entries = {}
+        self.cable_field_pools = {}
+        
+        # Initialize with cluster category
+        self.select_cable_category('cluster')
+        
+        # Buttons
+        btn_frame = tk.Frame(left_col, bg=self.colors['bg_main'])
+        btn_frame.pack(fill=tk.X, pady=(24, 0))
+        
+        ModernButton(btn_frame, "GENERATE", self.generate_cable,
+                    self.colors['button_blue'], self.colors['button_blue_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 6))
+        
+        ModernButton(btn_frame, "RESET", self.reset_cable,
+                    self.colors['button_gray'], self.colors['button_gray_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        
+        ModernButton(btn_frame, "COPY", lambda: self.copy_result(self.cable_output),
+                    self.colors['button_green'], self.colors['button_green_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 0))
+        
+        # Output section
+        self.cable_output = self.create_output_section(right_col)
+        
+        return panel
+    
+    @timed('switch category')
+    def select_cable_category(self, category):
+        """Select cable category and update button colors"""
+        self.cable_category.set(category)
+        
+        # Update button colors
+        for cat, btn in self.category_buttons.items():
+            if cat == category:
+                btn.configure(bg=self.colors['button_green'], fg='white')
+            else:
+                btn.configure(bg=self.colors['bg_input'], fg=self.colors['text_secondary'])
+        
+        self.update_cable_fields()
+        self.schedule_live(self.generate_cable)
+    
+    def update_cable_fields(self):
+        """Show the input fields of the selected category"""
+        category = self.cable_category.get()
+        
+        # Each category's fields are built once, then only shown or hidden
+        if category not in self.cable_field_pools:
+            self.cable_field_pools[category] = self.create_cable_fields(category)
+        
+        for cat, pool in self.cable_field_pools.items():
+            if cat == category:
+                pool['frame'].grid(row=0, column=0, sticky='ew')
+            else:
+                pool['frame'].grid_remove()
+        
+        pool = self.cable_field_pools[category]
+        self.cable_entries = pool['entries']
+        self.cable_type_var = pool['cable_type_var']
+        self.feeder_type_var = pool.get('feeder_type_var')
+    
+    def create_cable_fields(self, category):
+        """Create the input fields of one cable category"""
+        frame = tk.Frame(self.cable_inputs_frame, bg=self.colors['bg_section'])
+        frame.grid_columnconfigure(0, weight=1)
+        
+        pool = {'frame': frame, 'entries': {}}
+        entries = pool['entries']
+        row = 0
+        
+        if category == 'feeder':
+            entries['olt'] = self.create_input_field(frame, "OLT Code:", row)
+            row += 2
+        
+        entries['fdt'] = self.create_input_field(frame, "FDT Code:", row)
+        row += 2
+        
+        if category == 'cluster':
+            entries['line'] = self.create_input_field(frame, "Line Code:", row)
+            row += 2
+        
+        # Feeder Type dropdown (only for feeder)
+        if category == 'feeder':
+            label = tk.Label(frame, text="Feeder Type:",
+                            bg=self.colors['bg_section'],
+                            fg=self.colors['text_label'],
+                            font=('Segoe UI', 9), anchor='w')
+            label.grid(row=row, column=0, sticky='w', pady=(0, 12))
+            
+            feeder_types = self.profile.feeder_types
+            pool['feeder_type_var'] = tk.StringVar(value=feeder_types[0])
+            
+            combo_feeder = ttk.Combobox(frame, textvariable=pool['feeder_type_var'],
+                                values=feeder_types, state='readonly', font=('Segoe UI', 9))
+            combo_feeder.grid(row=row+1, column=0, sticky='ew', pady=(0, 12), ipady=4)
+            row += 2
+        
+        # Cable Type dropdown
+        label = tk.Label(frame, text="Cable Type:",
+                        bg=self.colors['bg_section'],
+                        fg=self.colors['text_label'],
+                        font=('Segoe UI', 9), anchor='w')
+        label.grid(row=row, column=0, sticky='w', pady=(0, 12))
+        
+        if category == 'cluster':
+            cable_types = self.profile.cluster_cable_types
+        else:
+            cable_types = self.profile.feeder_cable_types
+        
+        pool['cable_type_var'] = tk.StringVar(value=cable_types[0])
+        
+        combo = ttk.Combobox(frame, textvariable=pool['cable_type_var'],
+                            values=cable_types, state='readonly', font=('Segoe UI', 9))
+        combo.grid(row=row+1, column=0, sticky='ew', pady=(0, 12), ipady=4)
+        row += 2
+        
+        entries['length'] = self.create_input_field(frame, "Length by OTDR (m):", row)
+        self.create_link(frame, "Import SOR...", row,
+                        lambda: (self.import_sor(entries['length'], self.cable_output),
+                                 self.schedule_live(self.generate_cable)))
+        
+        self.bind_live(frame.winfo_children(), self.generate_cable)
+        
+        return pool
+    
+    @timed('generate cable')
+    def generate_cable(self, save=True):
+        """Generate cable name"""
+        category = self.cable_category.get()
+        
+        try:
+            if category == 'cluster':
+                fdt = self.cable_entries['fdt'].get().strip()
+                line = self.cable_entries['line'].get().strip()
+                ctype = self.cable_type_var.get()
+                length = self.cable_entries['length'].get().strip()
+                
+                fields = {'fdt': fdt, 'line': line}
+                if not self.validate_fields(category, self.cable_output,
+                                            dict(fields, cable_type=ctype, otdr=length)):
+                    return
+                result = self.profile.cluster_cable_name(fdt, line, ctype, length)
+            else:
+                olt = self.cable_entries['olt'].get().strip()
+                fdt = self.cable_entries['fdt'].get().strip()
+                feeder_type = self.feeder_type_var.get()
+                ctype = self.cable_type_var.get()
+                length = self.cable_entries['length'].get().strip()
+                
+                fields = {'olt': olt, 'fdt': fdt, 'feeder_type': feeder_type}
+                if not self.validate_fields(category, self.cable_output,
+                                            dict(fields, cable_type=ctype, otdr=length)):
+                    return
+                result = self.profile.feeder_cable_name(olt, fdt, feeder_type, ctype, length)
+            
+            self.set_output(self.cable_output, result)
+            if save:
+                self.save_result(category=category, cable_type=ctype, otdr=length,
+                                 name=result, **fields)
+        except Exception as e:
+            self.set_output(self.cable_output, f"Error: {str(e)}")
+    
+    @timed('reset cable')
+    def reset_cable(self):
+        """Reset cable inputs"""
+        for entry in self.cable_entries.values():
+            if isinstance(entry, tk.Entry):
+                entry.delete(0, tk.END)
+        self.mark_fields(self.field_entries(self.cable_category.get()), {})
+        self.set_output(self.cable_output, "")
+    
+    def create_ci_panel(self):
+        """CI Description Generator Panel"""
+        panel = tk.Frame(self.content_frame, bg=self.colors['bg_main'])
+        
+        # Two column layout
+        left_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        right_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
+        
+        # Input section
+        input_container = self.create_input_section(left_col)
+        input_container.grid_columnconfigure(0, weight=1)
+        
+        self.ci_entries = {}
+        row = 0
+        
+        for key, label in [('route', 'Route (m):'), ('fdt', 'Slack FDT (unit):'),
+                          ('fat', 'Slack FAT (unit):'), ('otdr', 'By OTDR (m):')]:
+            self.ci_entries[key] = self.create_input_field(input_container, label, row)
+            row += 2
+        
+        self.bind_live(self.ci_entries.values(), self.generate_ci)
+        
+        self.create_link(input_container, "Import SOR...", 6,
+                        lambda: (self.import_sor(self.ci_entries['otdr'], self.ci_output),
+                                 self.schedule_live(self.generate_ci)))
+        
+        self.create_link(input_container, "Import KML/GeoJSON...", 0,
+                        lambda: (self.import_route(self.ci_entries['route'], self.ci_output,
+                                                   {'fdt': self.ci_entries['fdt'],
+                                                    'fat': self.ci_entries['fat']}),
+                                 self.schedule_live(self.generate_ci)))
+        
+        # Buttons
+        btn_frame = tk.Frame(left_col, bg=self.colors['bg_main'])
+        btn_frame.pack(fill=tk.X, pady=(24, 0))
+        
+        ModernButton(btn_frame, "GENERATE", self.generate_ci,
+                    self.colors['button_blue'], self.colors['button_blue_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 6))
+        
+        ModernButton(btn_frame, "RESET", self.reset_ci,
+                    self.colors['button_gray'], self.colors['button_gray_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        
+        ModernButton(btn_frame, "COPY", lambda: self.copy_result(self.ci_output),
+                    self.colors['button_green'], self.colors['button_green_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 0))
+        
+        # Output section
+        self.ci_output = self.create_output_section(right_col)
+        
+        return panel
+    
+    @timed('generate ci')
+    def generate_ci(self, save=True):
+        """Generate CI description"""
+        try:
+            entries = self.ci_entries
+            if not self.validate_fields('ci', self.ci_output,
+                                        {'route': entries['route'].get(),
+                                         'slack_fdt': entries['fdt'].get(),
+                                         'slack_fat': entries['fat'].get(),
+                                         'otdr': entries['otdr'].get()}):
+                return
+            route = parse_number(self.ci_entries['route'].get())
+            fdt = parse_number(self.ci_entries['fdt'].get())
+            fat = parse_number(self.ci_entries['fat'].get())
+            otdr = self.ci_entries['otdr'].get() or '0'
+            
+            result = self.profile.cluster_description(route, fdt, fat, otdr)
+            
+            self.set_output(self.ci_output, result)
+            if save:
+                self.save_result(category='cluster', route=route, slack_fdt=fdt,
+                                 slack_fat=fat, otdr=otdr, description=result)
+        except Exception as e:
+            self.set_output(self.ci_output, f"Error: {str(e)}")
+    
+    @timed('reset ci')
+    def reset_ci(self):
+        """Reset CI inputs"""
+        for entry in self.ci_entries.values():
+            entry.delete(0, tk.END)
+        self.mark_fields(self.field_entries('ci'), {})
+        self.set_output(self.ci_output, "")
+    
+    def create_feeder_panel(self):
+        """Feeder Description Generator Panel"""
+        panel = tk.Frame(self.content_frame, bg=self.colors['bg_main'])
+        
+        # Two column layout
+        left_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        right_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
+        
+        # Input section
+        input_container = self.create_input_section(left_col)
+        input_container.grid_columnconfigure(0, weight=1)
+        
+        self.feeder_entries = {}
+        row = 0
+        
+        for key, label in [('route', 'Route (m):'), ('slack', 'Slack (unit):'),
+                          ('otdr', 'By OTDR (m):')]:
+            self.feeder_entries[key] = self.create_input_field(input_container, label, row)
+            row += 2
+        
+        self.bind_live(self.feeder_entries.values(), self.generate_feeder)
+        
+        self.create_link(input_container, "Import SOR...", 4,
+                        lambda: (self.import_sor(self.feeder_entries['otdr'], self.feeder_output),
+                                 self.schedule_live(self.generate_feeder)))
+        
+        self.create_link(input_container, "Import KML/GeoJSON...", 0,
+                        lambda: (self.import_route(self.feeder_entries['route'], self.feeder_output),
+                                 self.schedule_live(self.generate_feeder)))
+        
+        # Buttons
+        btn_frame = tk.Frame(left_col, bg=self.colors['bg_main'])
+        btn_frame.pack(fill=tk.X, pady=(24, 0))
+        
+        ModernButton(btn_frame, "GENERATE", self.generate_feeder,
+                    self.colors['button_blue'], self.colors['button_blue_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 6))
+        
+        ModernButton(btn_frame, "RESET", self.reset_feeder,
+                    self.colors['button_gray'], self.colors['button_gray_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        
+        ModernButton(btn_frame, "COPY", lambda: self.copy_result(self.feeder_output),
+                    self.colors['button_green'], self.colors['button_green_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 0))
+        
+        # Output section
+        self.feeder_output = self.create_output_section(right_col)
+        
+        return panel
+    
+    @timed('generate feeder')
+    def generate_feeder(self, save=True):
+        """Generate feeder description"""
+        try:
+            entries = self.feeder_entries
+            if not self.validate_fields('feeder_desc', self.feeder_output,
+                                        {'route': entries['route'].get(),
+                                         'slack': entries['slack'].get(),
+                                         'otdr': entries['otdr'].get()}):
+                return
+            route = parse_number(self.feeder_entries['route'].get())
+            slack = parse_number(self.feeder_entries['slack'].get())
+            otdr = self.feeder_entries['otdr'].get() or '0'
+            
+            result = self.profile.feeder_description(route, slack, otdr)
+            
+            self.set_output(self.feeder_output, result)
+            if save:
+                self.save_result(category='feeder', route=route, slack=slack, otdr=otdr,
+                                 description=result)
+        except Exception as e:
+            self.set_output(self.feeder_output, f"Error: {str(e)}")
+    
+    @timed('reset feeder')
+    def reset_feeder(self):
+        """Reset feeder inputs"""
+        for entry in self.feeder_entries.values():
+            entry.delete(0, tk.END)
+        self.mark_fields(self.field_entries('feeder_desc'), {})
+        self.set_output(self.feeder_output, "")
+    
+    def create_batch_panel(self):
+        """Batch Processing Panel"""
+        panel = tk.Frame(self.content_frame, bg=self.colors['bg_main'])
+        
+        # Two column layout
+        left_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        right_col = tk.Frame(panel, bg=self.colors['bg_main'])
+        right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
+        
+        # Input section
+        input_container = self.create_input_section(left_col)
+        input_container.grid_columnconfigure(0, weight=1)
+        
+        self.batch_entries = {}
+        self.batch_job = None
+        row = 0
+        
+        for key, label, save in [('input', 'Input CSV:', False), ('output', 'Output CSV:', True),
+                                 ('routes', 'Routes KML/GeoJSON (optional):', False)]:
+            self.batch_entries[key] = self.create_input_field(input_container, label, row)
+            self.create_link(input_container, "Browse...", row,
+                            lambda k=key, s=save: self.browse_file(self.batch_entries[k], s))
+            row += 2
+        
+        # Progress
+        self.batch_progress = ttk.Progressbar(input_container, mode='determinate', maximum=1.0)
+        self.batch_progress.grid(row=row, column=0, sticky='ew', pady=(12, 0))
+        
+        # Buttons
+        btn_frame = tk.Frame(left_col, bg=self.colors['bg_main'])
+        btn_frame.pack(fill=tk.X, pady=(24, 0))
+        
+        ModernButton(btn_frame, "RUN", self.run_batch_job,
+                    self.colors['button_blue'], self.colors['button_blue_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 6))
+        
+        ModernButton(btn_frame, "CANCEL", self.cancel_batch_job,
+                    self.colors['button_gray'], self.colors['button_gray_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        
+        ModernButton(btn_frame, "COPY", self.copy_batch_result,
+                    self.colors['button_green'], self.colors['button_green_hover'],
+                    width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(6, 0))
+        
+        # Output section
+        self.batch_output = self.create_output_section(right_col, "Status", height=3)
+        self.batch_table = self.create_table_section(right_col, export=self.export_batch_table)
+        
+        return panel
+    
+    def browse_file(self, entry, save=False):
+        """Fill an entry with a file chosen in a dialog"""
+        from tkinter import filedialog
+        if save:
+            path = filedialog.asksaveasfilename(defaultextension='.csv',
+                                                filetypes=[("CSV files", "*.csv"),
+                                                           ("Excel workbook", "*.xlsx")])
+        else:
+            path = filedialog.askopenfilename()
+        if path:
+            entry.delete(0, tk.END)
+            entry.insert(0, path)
+    
+    def run_batch_job(self):
+        """Start a batch run on a worker thread, the window stays responsive"""
+        from cable_jobs import Job, batch_results_job
+        if self.batch_job and self.batch_job.running:
+            return
+        
+        input_path = self.batch_entries['input'].get().strip()
+        output_path = self.batch_entries['output'].get().strip()
+        if not input_path or not output_path:
+            self.set_output(self.batch_output, "Error: choose an input and an output CSV")
+            return
+        
+        # The route table is read by the job, a large file must not block the UI
+        routes_path = self.batch_entries['routes'].get().strip() or None
+        
+        self.batch_progress['value'] = 0
+        self.set_output(self.batch_output, "Running...")
+        self.batch_job = Job(batch_results_job, input_path, output_path, routes_path).start()
+        self.poll_batch_job()
+    
+    def cancel_batch_job(self):
+        """Ask the running batch job to stop at its next progress report"""
+        if self.batch_job and self.batch_job.running:
+            self.batch_job.cancel()
+            self.set_output(self.batch_output, "Cancelling...")
+    
+    def poll_batch_job(self):
+        """Apply queued job events, reschedules itself while the job runs"""
+        from cable_jobs import POLL_MS
+        job = self.batch_job
+        for event in job.poll():
+            kind, value = event[0], event[1]
+            if kind == 'progress':
+                if event[2] is not None:
+                    self.batch_progress['value'] = event[2]
+                if not job.cancel_event.is_set():
+                    self.set_output(self.batch_output,
+                                    f"Rows: {value:,}\n"
+                                    f"Elapsed: {job.elapsed:.1f} s\n"
+                                    f"Throughput: {job.rate:,.0f} rows/s")
+            elif kind == 'done':
+                count, view = value
+                self.batch_progress['value'] = 1.0
+                self.set_output(self.batch_output,
+                                f"Done: {count:,} rows in {job.elapsed:.1f} s\n"
+                                f"Throughput: {job.rate:,.0f} rows/s")
+                if view is not None:
+                    self.batch_table.set_view(view)
+                return
+            elif kind == 'cancelled':
+                self.batch_progress['value'] = 0
+                self.set_output(self.batch_output, f"Cancelled after {job.done:,} rows")
+                return
+            elif kind == 'error':
+                self.set_output(self.batch_output, f"Error: {value}")
+                return
+        self.root.after(POLL_MS, self.poll_batch_job)
+    
+    def export_batch_table(self):
+        """Export the table rows, in their current sort and filter, on a worker thread"""
+        from tkinter import filedialog
+        from cable_jobs import Job, export_job
+        view = self.batch_table.view
+        if view is None or not len(view):
+            self.set_output(self.batch_output, "Error: no results to export")
+            return
+        if self.batch_job and self.batch_job.running:
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.xlsx',
+                                            filetypes=[("Excel workbook", "*.xlsx"),
+                                                       ("CSV files", "*.csv")])
+        if not path:
+            return
+        
+        self.set_output(self.batch_output, "Exporting...")
+        self.batch_job = Job(export_job, view, path).start()
+        self.poll_export_job()
+    
+    def poll_export_job(self):
+        """Report the export once the worker finishes"""
+        from cable_jobs import POLL_MS
+        job = self.batch_job
+        for kind, value in job.poll():
+            if kind == 'done':
+                self.set_output(self.batch_output,
+                                f"Exported {value:,} rows in {job.elapsed:.1f} s")
+                return
+            if kind == 'error':
+                self.set_output(self.batch_output, f"Error: {value}")
+                return
+        self.root.after(POLL_MS, self.poll_export_job)
+    
+    @timed('copy batch')
+    def copy_batch_result(self):
+        """Copy the selected result name, or the status without a selection"""
+        row = self.batch_table.selected_row()
+        if row:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(row[0])
+        else:
+            self.copy_result(self.batch_output)
+    
+    def import_route(self, entry, output, slack_entries=None):
+        """Fill a Route (m) entry with the total length of a route file
+        
+        FDT/FAT points in the same file fill slack_entries ({kind: entry})
+        with the number of points snapped to the route.
+        """
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Import Route",
+            filetypes=[("Route files", "*.kml *.geojson *.json *.geojsonl"),
+                       ("All files", "*.*")])
+        if not path:
+            return
+        
+        try:
+            from cable_routes import iter_route_lengths, load_points, load_routes
+            routes = list(load_routes(path))
+            length = sum(length for _, length in iter_route_lengths(routes))
+            entry.delete(0, tk.END)
+            entry.insert(0, f"{length:.2f}")
+            
+            points = [p for p in load_points(path) if p.kind] if slack_entries else []
+            if points:
+                from cable_spatial import PointGrid
+                counts = PointGrid(points).count_kinds(
+                    [part for route in routes for part in route.parts])
+                for kind, slack_entry in slack_entries.items():
+                    slack_entry.delete(0, tk.END)
+                    slack_entry.insert(0, str(counts[kind]))
+        except Exception as e:
+            self.set_output(output, f"Error: {str(e)}")
+    
+    def import_sor(self, entry, output):
+        """Fill an OTDR entry with the fiber length of an SR-4731 trace"""
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Import OTDR Trace",
+            filetypes=[("OTDR traces", "*.sor *.SOR"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        try:
+            from cable_otdr import otdr_text, read_sor
+            sor = read_sor(path)
+            entry.delete(0, tk.END)
+            entry.insert(0, otdr_text(sor.length))
+        except Exception as e:
+            self.set_output(output, f"Error: {str(e)}")
+    
+    def save_result(self, **fields):
+        """Upsert a generated result into the project store, if one was given"""
+        if self.store_path is None:
+            return
+        try:
+            if self.store is None:
+                from cable_store import ProjectStore
+                self.store = ProjectStore(self.store_path)
+            self.store.save(**fields)
+        except Exception as e:
+            # A locked or read-only store must not block generating names
+            print(f"Project store: {e}", file=sys.stderr)
+    
+    def field_entries(self, form):
+        """{validator field: Entry} of a form ('cluster'/'feeder' name, 'ci', 'feeder_desc')"""
+        if form == 'ci':
+            entries = self.ci_entries
+            return {'route': entries['route'], 'slack_fdt': entries['fdt'],
+                    'slack_fat': entries['fat'], 'otdr': entries['otdr']}
+        if form == 'feeder_desc':
+            return dict(self.feeder_entries)
+        entries = dict(self.cable_entries)
+        entries['otdr'] = entries.pop('length')
+        return entries
+    
+    def mark_fields(self, entries, problems):
+        """Outline the entries of invalid fields"""
+        for field, entry in entries.items():
+            color = self.colors['error'] if field in problems else self.colors['border']
+            entry.configure(highlightbackground=color)
+    
+    def validate_fields(self, form, output, fields):
+        """Check a form's values, mark and list the invalid ones
+        
+        Name forms ('cluster'/'feeder') also check required codes. Returns
+        True when every field is valid.
+        """
+        category = form if form in ('cluster', 'feeder') else None
+        problems = self.validator.check_fields(fields, category)
+        self.mark_fields(self.field_entries(form), problems)
+        if problems:
+            self.set_output(output, "Invalid input:\n" + '\n'.join(
+                f"  {FIELD_LABELS.get(field, field)}: {message}"
+                for field, message in problems.items()))
+        return not problems
+    
+    def set_output(self, text_widget, content):
+        """Set text in output widget, rewriting only the lines that changed"""
+        new_lines = (content if content else "Result will be displayed here...").split('\n')
+        old_lines = text_widget.get(1.0, 'end-1c').split('\n')
+        if new_lines == old_lines:
+            return
+        
+        text_widget.config(state='normal')
+        for i, (old, new) in enumerate(zip(old_lines, new_lines), start=1):
+            if old != new:
+                text_widget.delete(f"{i}.0", f"{i}.end")
+                text_widget.insert(f"{i}.0", new)
+        if len(new_lines) < len(old_lines):
+            text_widget.delete(f"{len(new_lines)}.end", 'end-1c')
+        elif len(new_lines) > len(old_lines):
+            text_widget.insert('end-1c', '\n' + '\n'.join(new_lines[len(old_lines):]))
+        text_widget.config(state='disabled')
+    
+    def show_diagnostics(self):
+        """Hidden diagnostics view (F12 / Ctrl+Shift+D): action timings and profiling"""
+        if self.diagnostics is not None and self.diagnostics.winfo_exists():
+            self.diagnostics.lift()
+            return
+        
+        window = self.diagnostics = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.geometry("720x520")
+        window.configure(bg=self.colors['bg_main'])
+        
+        btn_frame = tk.Frame(window, bg=self.colors['bg_main'])
+        btn_frame.pack(fill=tk.X, padx=16, pady=(16, 0))
+        
+        output = tk.Text(window, bg=self.colors['output_bg'], fg=self.colors['output_text'],
+                        font=('Consolas', 9), relief=tk.FLAT, padx=16, pady=16,
+                        wrap=tk.NONE, state='disabled')
+        output.pack(fill=tk.BOTH, expand=True, padx=16, pady=16)
+        
+        def refresh():
+            startup = '\n'.join(f"{label:>16}: {seconds * 1000:8.1f} ms"
+                                 for label, seconds in self.timings.items())
+            profiling = "ON" if INSTRUMENTS.profiling else "OFF"
+            self.set_output(output, f"{INSTRUMENTS.report(bars=True)}\n\n"
+                                    f"Startup and panel build times:\n{startup}\n\n"
+                                    f"cProfile: {profiling}")
+        
+        def toggle_profile():
+            if not INSTRUMENTS.profiling:
+                INSTRUMENTS.start_profile()
+                refresh()
+                return
+            from tkinter import filedialog
+            from cable_instrument import DEFAULT_PROFILE
+            path = filedialog.asksaveasfilename(parent=window, initialfile=DEFAULT_PROFILE,
+                                                defaultextension='.prof')
+            if path:
+                stats = INSTRUMENTS.stop_profile(path)
+            else:
+                stats = ''
+                INSTRUMENTS.cancel_profile()
+            refresh()
+            if stats:
+                self.set_output(output, output.get(1.0, 'end-1c') + "\n\n" + stats)
+        
+        def clear():
+            INSTRUMENTS.clear()
+            refresh()
+        
+        for text, command, color, hover in [
+                ("REFRESH", refresh, 'button_blue', 'button_blue_hover'),
+                ("START/STOP PROFILE", toggle_profile, 'button_green', 'button_green_hover'),
+                ("CLEAR", clear, 'button_gray', 'button_gray_hover')]:
+            ModernButton(btn_frame, text, command, self.colors[color], self.colors[hover],
+                        width=150).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        
+        refresh()
+    
+    @timed('copy')
+    def copy_result(self, text_widget):
+        """Copy result to clipboard"""
+        content = text_widget.get(1.0, tk.END).strip()
+        if content and content != "Result will be displayed here...":
+            self.root.clipboard_clear()
+            self.root.clipboard_append(content)
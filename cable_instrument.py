@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Instrumentation
+Timing histograms for GUI actions and an on/off cProfile session
+"""
+
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Histogram bucket upper bounds in milliseconds, the last bucket is open
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+DEFAULT_PROFILE = 'cable_generator.prof'
+
+
+class Histogram:
+    """Fixed-bucket timing histogram with exact count/min/max/mean"""
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of samples
+
+        Accurate to the bucket width, capped at the slowest sample.
+        """
+        if not self.count:
+            return 0.0
+        needed = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + (self.max,), self.counts):
+            seen += count
+            if seen >= needed:
+                return min(bound, self.max)
+        return self.max
+
+    def bars(self, width=30):
+        """One text line per non-empty bucket"""
+        peak = max(self.counts) or 1
+        lines = []
+        lower = 0
+        for bound, count in zip(BUCKETS_MS + (None,), self.counts):
+            if count:
+                label = f"> {lower:g} ms" if bound is None else f"<= {bound:g} ms"
+                lines.append(f"{label:>12} {'#' * max(1, count * width // peak)} {count}")
+            lower = bound
+        return lines
+
+
+class Instruments:
+    """Named timing histograms plus a cProfile toggle"""
+    def __init__(self):
+        self.histograms = {}
+        self.profiler = None
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds * 1000)
+
+    def timed(self, name):
+        """Decorator recording each call's duration under name"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        self.histograms.clear()
+
+    def report(self, bars=False):
+        """Text table of every histogram, optionally with bucket bars"""
+        lines = [f"{'action (ms)':24s} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            lines.append(f"{name:24s} {h.count:7d} {h.mean:8.2f} {h.percentile(0.5):8.2f} "
+                         f"{h.percentile(0.95):8.2f} {h.max:8.2f}")
+            if bars:
+                lines.extend('    ' + line for line in h.bars())
+        if len(lines) == 1:
+            lines.append("(no actions recorded yet)")
+        return '\n'.join(lines)
+
+    @property
+    def profiling(self):
+        return self.profiler is not None
+
+    def start_profile(self):
+        """Start a cProfile session, no-op if one is running"""
+        if self.profiler is None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def cancel_profile(self):
+        """Stop the session without saving it"""
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler = None
+
+    def stop_profile(self, path=DEFAULT_PROFILE, top=25):
+        """Stop the session, dump stats to path and return the top functions"""
+        import io
+        import pstats
+        if self.profiler is None:
+            return ''
+        profiler, self.profiler = self.profiler, None
+        profiler.disable()
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats('cumulative').print_stats(top)
+        return f"Profile written to {path}\n{out.getvalue()}"
+
+
+INSTRUMENTS = Instruments()
+timed = INSTRUMENTS.timed
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Background Jobs
+Worker-thread job runner polled from the Tk loop, with progress and cancellation
+"""
+
+import os
+import queue
+import threading
+import time
+
+POLL_MS = 100  # Tk poll interval for job events
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancel() was requested"""
+
+
+class Job:
+    """Runs target(job) on a daemon thread, events go through a thread-safe queue
+
+    The worker calls job.report(done, fraction) from the target; the Tk
+    side drains job.poll() from root.after and never blocks on the worker.
+    Events are ('progress', done, fraction), ('done', result),
+    ('cancelled', None) and ('error', message).
+    """
+    def __init__(self, target, *args):
+        self.target = target
+        self.args = args
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.start_time = None
+        self.done = 0
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return self.thread.is_alive()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time if self.start_time else 0.0
+
+    @property
+    def rate(self):
+        """Processed items per second"""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed else 0.0
+
+    def report(self, done, fraction=None):
+        """Called by the worker: queue progress, raise JobCancelled on cancel"""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+        self.events.put(('progress', done, fraction))
+
+    def poll(self):
+        """Drain pending events without blocking, latest progress only"""
+        events = []
+        progress = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'progress':
+                progress = event
+                self.done = event[1]
+            else:
+                events.append(event)
+        return ([progress] if progress else []) + events
+
+    def _run(self):
+        try:
+            result = self.target(self, *self.args)
+        except JobCancelled:
+            self.events.put(('cancelled', None))
+        except Exception as e:
+            self.events.put(('error', str(e)))
+        else:
+            self.events.put(('done', result))
+
+
+def batch_job(job, input_path, output_path, routes_path=None):
+    """Job target for run_batch, a cancelled run removes its partial output
+
+    The route table of routes_path is read here too, off the UI thread; a
+    route file that does not parse ends the job with its error.
+    """
+    from cable_batch import iter_route_table, run_batch
+    routes = dict(iter_route_table(routes_path)) if routes_path else None
+    try:
+        return run_batch(input_path, output_path, routes, progress=job.report)
+    except JobCancelled:
+        if output_path != '-' and os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+
+def batch_results_job(job, input_path, output_path, routes_path=None):
+    """batch_job, then load a CSV output into a ResultView; returns (rows, view)
+
+    The view is None for an XLSX output.
+    """
+    from cable_export import is_xlsx
+    from cable_results import ResultView
+    count = batch_job(job, input_path, output_path, routes_path)
+    if is_xlsx(output_path):
+        return count, None
+    return count, ResultView.from_csv(output_path)
+
+
+def export_job(job, view, path):
+    """Job target: stream a ResultView to CSV/XLSX, return row count"""
+    from cable_export import export_rows
+    from cable_results import RESULT_COLUMNS
+    return export_rows(view.records(), path, RESULT_COLUMNS)
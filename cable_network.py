@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Network Model
+Persistent OLT -> FDT -> line -> FAT model with incremental recomputation
+
+Every FDT carries its feeder segment (OLT -> FDT) and every line its
+cluster segment (FDT -> line). Editing a segment only marks it dirty;
+refresh() recomputes the dirty segments and pushes the length change up
+their path, so one edit costs O(depth) regardless of network size.
+"""
+
+from cable_engine import (active_profile, parse_number, total_length,
+                          cluster_cable_name, feeder_cable_name,
+                          cluster_description, feeder_description)
+
+
+class Node:
+    """Network node holding the cable length of its whole subtree"""
+    __slots__ = ('network', 'code', 'parent', 'children', '_subtree_length')
+    level = None
+
+    def __init__(self, network, code, parent=None):
+        self.network = network
+        self.code = code
+        self.parent = parent
+        self.children = {}
+        self._subtree_length = 0
+        if parent is not None:
+            parent.children[code] = self
+
+    @property
+    def subtree_length(self):
+        """Total cable length (m) of every segment below and at this node"""
+        self.network.refresh()
+        return self._subtree_length
+
+    def path(self):
+        """Codes from the OLT down to this node"""
+        codes = []
+        node = self
+        while node is not None:
+            codes.append(node.code)
+            node = node.parent
+        return tuple(reversed(codes))
+
+    def _add_length(self, delta):
+        """Push a length change up to the root"""
+        node = self
+        while node is not None:
+            node._subtree_length += delta
+            node = node.parent
+
+
+class Segment(Node):
+    """Node that owns a cable segment with a cached total and description"""
+    __slots__ = ('route', 'otdr', 'cable_type', 'length', 'description', 'dirty')
+    fields = ('route', 'otdr', 'cable_type')
+
+    def __init__(self, network, code, parent, route=0.0, otdr='0', cable_type=''):
+        super().__init__(network, code, parent)
+        self.route = float(route)
+        self.otdr = otdr
+        self.cable_type = cable_type
+        self.length = 0
+        self.description = ''
+        self.dirty = False
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        if not self.dirty:
+            self.dirty = True
+            self.network._dirty.append(self)
+
+    def update(self, **fields):
+        """Change segment inputs, recomputation is deferred to refresh()"""
+        for key, value in fields.items():
+            if key not in self.fields:
+                raise AttributeError(f"{type(self).__name__} has no field '{key}'")
+            if key == 'route' or key.startswith('slack'):
+                value = None if value is None else float(value)
+            setattr(self, key, value)
+        self.mark_dirty()
+
+    def recompute(self):
+        """Recalculate this segment and return the change in total length"""
+        old = self.length
+        self.length, self.description = self.calculate()
+        self.dirty = False
+        return self.length - old
+
+    @property
+    def total_length(self):
+        if self.dirty:
+            self.network.refresh()
+        return self.length
+
+
+class OLT(Node):
+    __slots__ = ()
+    level = 'olt'
+
+
+class FDT(Segment):
+    """FDT with its feeder segment from the OLT
+
+    feeder is False for an FDT only created as the parent of lines: it has
+    no feeder segment until its feeder fields are set.
+    """
+    __slots__ = ('slack', 'feeder_type', 'feeder')
+    level = 'fdt'
+    fields = Segment.fields + ('slack', 'feeder_type')
+
+    def __init__(self, network, code, parent, route=0.0, slack=0.0, otdr='0',
+                 cable_type='', feeder_type=None, feeder=True):
+        self.slack = float(slack)
+        self.feeder_type = feeder_type or active_profile().feeder_types[0]
+        self.feeder = feeder
+        super().__init__(network, code, parent, route, otdr, cable_type)
+
+    def update(self, **fields):
+        super().update(**fields)
+        self.feeder = True
+
+    def calculate(self):
+        if not self.feeder:
+            return 0, ''
+        return (total_length(self.route, self.slack)[1],
+                feeder_description(self.route, self.slack, self.otdr))
+
+    @property
+    def name(self):
+        return feeder_cable_name(self.parent.code, self.code, self.feeder_type,
+                                 self.cable_type, self.otdr)
+
+
+class Line(Segment):
+    """Cluster line with its cable segment from the FDT
+
+    slack_fat None means one slack unit per FAT on the line.
+    """
+    __slots__ = ('slack_fdt', 'slack_fat')
+    level = 'line'
+    fields = Segment.fields + ('slack_fdt', 'slack_fat')
+
+    def __init__(self, network, code, parent, route=0.0, slack_fdt=0.0, slack_fat=None,
+                 otdr='0', cable_type=''):
+        self.slack_fdt = float(slack_fdt)
+        self.slack_fat = None if slack_fat is None else float(slack_fat)
+        super().__init__(network, code, parent, route, otdr, cable_type)
+
+    @property
+    def fat_slack(self):
+        return float(len(self.children)) if self.slack_fat is None else self.slack_fat
+
+    def calculate(self):
+        fat = self.fat_slack
+        return (total_length(self.route, self.slack_fdt + fat)[1],
+                cluster_description(self.route, self.slack_fdt, fat, self.otdr))
+
+    @property
+    def name(self):
+        return cluster_cable_name(self.parent.code, self.code, self.cable_type, self.otdr)
+
+
+class FAT(Node):
+    __slots__ = ()
+    level = 'fat'
+
+
+class Network:
+    """All OLTs of a project plus the queue of dirty segments"""
+    def __init__(self):
+        self.olts = {}
+        self._dirty = []
+
+    def refresh(self):
+        """Recompute dirty segments only and update the totals on their path"""
+        dirty, self._dirty = self._dirty, []
+        for segment in dirty:
+            if segment.dirty:
+                delta = segment.recompute()
+                if delta:
+                    segment._add_length(delta)
+
+    @property
+    def total_length(self):
+        self.refresh()
+        return sum(olt._subtree_length for olt in self.olts.values())
+
+    def olt(self, code):
+        """Get or create an OLT"""
+        node = self.olts.get(code)
+        if node is None:
+            node = self.olts[code] = OLT(self, code)
+        return node
+
+    def fdt(self, olt, code, **fields):
+        """Get or create an FDT, fields update its feeder segment"""
+        return self._fdt(olt, code, True, fields)
+
+    def _fdt(self, olt, code, feeder, fields):
+        parent = self.olt(olt)
+        node = parent.children.get(code)
+        if node is None:
+            return FDT(self, code, parent, feeder=feeder, **fields)
+        if fields or (feeder and not node.feeder):
+            node.update(**fields)
+        return node
+
+    def line(self, olt, fdt, code, **fields):
+        """Get or create a cluster line, fields update its segment"""
+        parent = self._fdt(olt, fdt, False, {})
+        node = parent.children.get(code)
+        if node is None:
+            return Line(self, code, parent, **fields)
+        if fields:
+            node.update(**fields)
+        return node
+
+    def add_fat(self, olt, fdt, line, code):
+        """Add a FAT, its line is recomputed when it counts FAT slack"""
+        parent = self.line(olt, fdt, line)
+        node = parent.children.get(code)
+        if node is None:
+            node = FAT(self, code, parent)
+            if parent.slack_fat is None:
+                parent.mark_dirty()
+        return node
+
+    def remove(self, node):
+        """Remove a node and its subtree
+
+        The removed node is detached from its parent, so later edits to it
+        no longer change the totals of the network.
+        """
+        self.refresh()
+        parent = node.parent
+        if parent is None:
+            if self.olts.get(node.code) is node:
+                del self.olts[node.code]
+            return
+        node._add_length(-node._subtree_length)
+        del parent.children[node.code]
+        node.parent = None
+        if isinstance(node, FAT) and parent.slack_fat is None:
+            parent.mark_dirty()
+
+    def find(self, *codes):
+        """Node at a path of codes (olt, fdt, line, fat), None if missing"""
+        node = self.olts.get(codes[0]) if codes else None
+        for code in codes[1:]:
+            if node is None:
+                break
+            node = node.children.get(code)
+        return node
+
+    def segments(self):
+        """Every FDT (feeder) and line (cluster) segment, depth first
+
+        FDTs that only group cluster lines have no feeder segment.
+        """
+        self.refresh()
+        for olt in self.olts.values():
+            for fdt in olt.children.values():
+                if fdt.feeder:
+                    yield fdt
+                yield from fdt.children.values()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a network from batch CSV rows (see cable_batch)"""
+        network = cls()
+        for row in rows:
+            def field(key):
+                return (row.get(key) or '').strip()
+
+            category = field('category').lower() or ('feeder' if field('olt') else 'cluster')
+            if category == 'feeder':
+                network.fdt(field('olt'), field('fdt'),
+                            route=parse_number(field('route')),
+                            slack=parse_number(field('slack')),
+                            otdr=field('otdr') or '0',
+                            cable_type=field('cable_type'),
+                            feeder_type=field('feeder_type') or active_profile().feeder_types[0])
+            else:
+                fields = {'route': parse_number(field('route')),
+                          'slack_fdt': parse_number(field('slack_fdt')),
+                          'otdr': field('otdr') or '0',
+                          'cable_type': field('cable_type')}
+                if field('slack_fat'):
+                    fields['slack_fat'] = parse_number(field('slack_fat'))
+                network.line(field('olt'), field('fdt'), field('line'), **fields)
+        return network
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - OTDR Import
+Reads fiber length and events from Bellcore/Telcordia SR-4731 (.sor) traces
+"""
+
+import csv
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from cable_batch import open_csv, row_category
+
+SPEED_OF_LIGHT = 299792458.0  # m/s in vacuum
+TOF_UNIT = 1e-10              # KeyEvents time of flight unit (100 ps)
+SCAN_CHUNK = 64               # trace files per process pool task
+TABLE_COLUMNS = ['file', 'key', 'otdr', 'wavelength', 'events', 'loss', 'error']
+
+# distance (m) from the trace start, losses in dB, type is the 8-char SR-4731 code
+Event = namedtuple('Event', ['distance', 'splice_loss', 'reflection', 'type'])
+# length: fiber length (m), wavelength (nm), loss: end-to-end loss (dB)
+Sor = namedtuple('Sor', ['version', 'wavelength', 'index', 'length', 'loss', 'events'])
+# One scanned trace file; error is '' when it parsed, key is its match key
+Trace = namedtuple('Trace', ['path', 'key', 'length', 'wavelength', 'events', 'loss', 'error'])
+
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_FXD_HEAD = {1: struct.Struct('<I2sHiH'), 2: struct.Struct('<I2sHiiH')}
+_EVENT = struct.Struct('<HIhhi8s')
+_EVENT_V2_EXTRA = 20  # five uint32 marker positions after the type in version 2
+_SUMMARY = struct.Struct('<iiIHiI')
+
+
+def _cstring(buf, pos):
+    """(text, position after the NUL) of a NUL-terminated string"""
+    end = buf.find(b'\0', pos)
+    if end < 0:
+        raise ValueError("truncated string")
+    return buf[pos:end].decode('latin-1'), end + 1
+
+
+def read_blocks(buf):
+    """(format version, {block name: (offset, size)}) from the map block
+
+    Version 2 files start with a 'Map' header and repeat each block's name
+    at its offset; the offsets returned point past that name.
+    """
+    if buf[:4] == b'Map\0':
+        version, pos = 2, 4
+    else:
+        version, pos = 1, 0
+    pos += 2  # map block revision
+    (offset,) = _U32.unpack_from(buf, pos)
+    (count,) = _U16.unpack_from(buf, pos + 4)
+    pos += 6
+    blocks = {}
+    for _ in range(count - 1):
+        name, pos = _cstring(buf, pos)
+        (size,) = _U32.unpack_from(buf, pos + 2)
+        pos += 6
+        start = offset
+        if version == 2:
+            start += len(name) + 1
+        blocks[name] = (start, size)
+        offset += size
+    if offset > len(buf):
+        raise ValueError("file shorter than its block map")
+    return version, blocks
+
+
+def parse_sor(buf):
+    """Sor of a trace buffer (bytes or mmap), only FxdParams and KeyEvents are read"""
+    version, blocks = read_blocks(buf)
+    for name in ('FxdParams', 'KeyEvents'):
+        if name not in blocks:
+            raise ValueError(f"no {name} block")
+
+    pos, _ = blocks['FxdParams']
+    head = _FXD_HEAD[version]
+    fields = head.unpack_from(buf, pos)
+    wavelength, pulses = fields[2], fields[-1]
+    # pulse widths (uint16), data spacing and point counts (uint32), then the index
+    pos += head.size + pulses * 10
+    (index,) = _U32.unpack_from(buf, pos)
+    if not index:
+        raise ValueError("no group index")
+    index /= 100000
+    meters = TOF_UNIT * SPEED_OF_LIGHT / index
+
+    pos, _ = blocks['KeyEvents']
+    (count,) = _U16.unpack_from(buf, pos)
+    pos += 2
+    events = []
+    for _ in range(count):
+        _, tof, _, splice, reflection, kind = _EVENT.unpack_from(buf, pos)
+        pos += _EVENT.size + (_EVENT_V2_EXTRA if version == 2 else 0)
+        _, pos = _cstring(buf, pos)
+        events.append(Event(tof * meters, splice / 1000, reflection / 1000,
+                            kind.decode('latin-1')))
+    loss, _, loss_end = _SUMMARY.unpack_from(buf, pos)[:3]
+
+    # The last event is the fiber end, the loss window end if there are none
+    length = events[-1].distance if events else loss_end * meters
+    return Sor(version, wavelength / 10 if wavelength > 2000 else float(wavelength),
+               index, length, loss / 1000, events)
+
+
+def read_sor(path):
+    """Sor of a .sor file, memory-mapped so only the parsed blocks are paged in"""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            raise ValueError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            try:
+                return parse_sor(buf)
+            except struct.error:
+                raise ValueError("truncated or damaged trace") from None
+
+
+def match_key(text):
+    """Upper-case text with every run of other characters as one '_'"""
+    return re.sub(r'[^A-Z0-9]+', '_', text.upper()).strip('_')
+
+
+def candidate_keys(key):
+    """key, then key without each trailing '_<number>' (core, wavelength)"""
+    yield key
+    while True:
+        head, sep, tail = key.rpartition('_')
+        if not sep or not tail.isdigit():
+            return
+        key = head
+        yield key
+
+
+def _read_traces(paths):
+    """Worker: Trace of each path, parse errors are kept per file"""
+    traces = []
+    for path in paths:
+        key = match_key(os.path.splitext(os.path.basename(path))[0])
+        try:
+            sor = read_sor(path)
+            traces.append(Trace(path, key, sor.length, sor.wavelength, len(sor.events),
+                                sor.loss, ''))
+        except (OSError, ValueError) as e:
+            traces.append(Trace(path, key, None, None, 0, None, str(e)))
+    return traces
+
+
+def find_traces(directory):
+    """Sorted paths of every .sor file below directory"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files
+                     if name.lower().endswith('.sor'))
+    return sorted(paths)
+
+
+def scan_traces(directory, workers=None, chunk=SCAN_CHUNK):
+    """Trace of every .sor file below directory, parsed in a process pool
+
+    Small directories (one chunk or workers=1) are read in this process.
+    """
+    paths = find_traces(directory)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= chunk:
+        return _read_traces(paths)
+    chunks = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [trace for traces in pool.map(_read_traces, chunks) for trace in traces]
+
+
+def otdr_text(length):
+    """OTDR field text of a length in meters"""
+    return str(round(length))
+
+
+def otdr_table(traces):
+    """{match key: OTDR text}, the longest trace wins when several match
+
+    Every trace is also listed under its key without core/wavelength
+    suffixes, so FDT01_A_003.sor fills the cable of FDT01/A.
+    """
+    lengths = {}
+    for trace in traces:
+        if trace.error:
+            continue
+        for key in candidate_keys(trace.key):
+            if trace.length > lengths.get(key, -1.0):
+                lengths[key] = trace.length
+    return {key: otdr_text(length) for key, length in lengths.items()}
+
+
+def row_keys(row):
+    """Match keys of a batch row: route_name, then FDT_LINE or OLT_FDT"""
+    def field(key):
+        return (row.get(key) or '').strip()
+
+    keys = []
+    if field('route_name'):
+        keys.append(match_key(field('route_name')))
+    if row_category(row) == 'feeder':
+        keys.append(match_key(f"{field('olt')}_{field('fdt')}"))
+    else:
+        keys.append(match_key(f"{field('fdt')}_{field('line')}"))
+    return keys
+
+
+def fill_otdr(rows, table):
+    """Generator stage: fill the empty otdr of rows from an otdr_table"""
+    for row in rows:
+        if not (row.get('otdr') or '').strip():
+            for key in row_keys(row):
+                otdr = table.get(key)
+                if otdr is not None:
+                    row = dict(row)
+                    row['otdr'] = otdr
+                    break
+        yield row
+
+
+def write_traces(traces, output_path='-'):
+    """Write scanned traces as CSV, return row count"""
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(TABLE_COLUMNS)
+        for trace in traces:
+            writer.writerow([trace.path, trace.key,
+                             '' if trace.error else otdr_text(trace.length),
+                             '' if trace.error else f"{trace.wavelength:g}",
+                             trace.events,
+                             '' if trace.error else f"{trace.loss:.3f}",
+                             trace.error])
+    return len(traces)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Parallel Batch Mode
+Splits a batch CSV into byte-range chunks and processes them in a process pool
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from cable_batch import process_row, output_fieldnames
+from cable_engine import active_profile, use_profile
+
+CHUNK_SIZE = 16 * 1024 * 1024  # bytes per work unit
+
+# Route and OTDR tables and the rule profile, loaded once per worker process
+_routes = None
+_otdr = None
+_profile = None
+
+
+def _init_worker(routes_path, points_path, tolerance, otdr=None, profile_rules=None):
+    """Worker initializer: load the route table, keep the OTDR table, compile the profile"""
+    global _routes, _otdr, _profile
+    if routes_path:
+        from cable_batch import iter_route_table
+        _routes = dict(iter_route_table(routes_path, points_path, tolerance))
+    _otdr = otdr
+    _profile = use_profile(profile_rules)
+
+
+def read_header(path):
+    """Return (fieldnames, byte offset of the first data row)"""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+    fieldnames = next(csv.reader([header.decode('utf-8-sig')]), [])
+    return fieldnames, data_start
+
+
+def split_chunks(path, data_start, chunk_size=CHUNK_SIZE):
+    """Byte ranges covering the data rows, each starting at a record boundary
+
+    Quoted fields may hold line breaks (batch output descriptions do), so a
+    boundary is the first newline past the target offset that has an even
+    number of quote characters before it. Doubled quotes inside a quoted
+    field count twice and keep the parity, so one pass over the file in
+    C-level count() calls is enough.
+    """
+    size = os.path.getsize(path)
+    boundaries = [data_start]
+    with open(path, 'rb') as f:
+        f.seek(data_start)
+        quotes = 0
+        position = data_start
+        offset = data_start + chunk_size
+        while offset < size:
+            block = f.read(offset - position)
+            quotes += block.count(b'"')
+            position += len(block)
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                quotes += line.count(b'"')
+                position += len(line)
+                if quotes % 2 == 0 and line.endswith(b'\n'):
+                    break
+            if position >= size:
+                break
+            boundaries.append(position)
+            offset = position + chunk_size
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _iter_lines(path, start, end):
+    """Decoded lines of one byte range"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8')
+
+
+def process_chunk(path, start, end, fieldnames, out_path):
+    """Worker: process one byte range into its own CSV part, return row count"""
+    out_fields = output_fieldnames(fieldnames)
+    count = 0
+    with open(out_path, 'w', newline='', encoding='utf-8') as dst:
+        reader = csv.DictReader(_iter_lines(path, start, end), fieldnames=fieldnames)
+        writer = csv.DictWriter(dst, out_fields, extrasaction='ignore')
+        if _otdr is not None:
+            from cable_otdr import fill_otdr
+            reader = fill_otdr(reader, _otdr)
+        for row in reader:
+            writer.writerow(process_row(row, _routes, _profile))
+            count += 1
+    return count
+
+
+def run_parallel(input_path, output_path, workers=None, chunk_size=CHUNK_SIZE,
+                 routes_path=None, points_path=None, tolerance=None, otdr=None,
+                 profile=None):
+    """Process a batch CSV with a process pool, output keeps input row order
+
+    Workers get the rules dict of profile (the active one by default) and
+    compile it once each.
+    """
+    profile = profile or active_profile()
+    fieldnames, data_start = read_header(input_path)
+    chunks = split_chunks(input_path, data_start, chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    count = 0
+    with tempfile.TemporaryDirectory(prefix='cablegen-') as tmp_dir:
+        parts = [os.path.join(tmp_dir, f'part-{i:06d}.csv') for i in range(len(chunks))]
+
+        with open(output_path, 'w', newline='', encoding='utf-8') as dst:
+            header = io.StringIO()
+            csv.writer(header).writerow(output_fieldnames(fieldnames))
+            dst.write(header.getvalue())
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(routes_path, points_path, tolerance,
+                                               otdr, profile.rules)) as pool:
+                results = pool.map(process_chunk,
+                                   [input_path] * len(chunks),
+                                   [start for start, _ in chunks],
+                                   [end for _, end in chunks],
+                                   [fieldnames] * len(chunks),
+                                   parts)
+                # map() yields in submission order, so parts merge in row order
+                for part, rows in zip(parts, results):
+                    with open(part, newline='', encoding='utf-8') as src:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(part)
+                    count += rows
+
+    return count
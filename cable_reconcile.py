@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - OTDR Reconciliation
+Variance of measured OTDR length against designed cable length, project-wide
+"""
+
+import csv
+import math
+from collections import namedtuple
+from itertools import islice
+
+from cable_batch import gc_paused, iter_project, open_csv
+from cable_engine import numpy_module, total_lengths
+
+VARIANCE_PCT = 5.0   # flag when |OTDR - design| is over this share of the design...
+VARIANCE_M = 20.0    # ...and over this many meters
+CHUNK_ROWS = 100000  # CSV rows transposed to columns at a time
+REPORT_COLUMNS = ['rank', 'row', 'name', 'category', 'design', 'otdr', 'variance',
+                  'variance_pct', 'flag']
+PROJECT_COLUMNS = ['category', 'olt', 'fdt', 'line', 'name', 'route', 'slack_fdt',
+                   'slack_fat', 'slack', 'otdr', 'error']
+
+# row: 1-based project row; design and otdr in meters; flag 'over', 'under' or ''
+Variance = namedtuple('Variance', ['row', 'name', 'category', 'design', 'otdr',
+                                   'variance', 'variance_pct', 'flag'])
+
+
+def _number(text, empty):
+    try:
+        return float(text) if text.strip() else empty
+    except ValueError:
+        return math.nan
+
+
+def _numbers(values, empty=0.0):
+    """Column as floats: empty -> empty, unparsable -> NaN (numpy array if available)"""
+    try:
+        numbers = list(map(float, values))
+    except ValueError:
+        # Columns with gaps (the other category's slack) have few distinct values
+        parsed = {value: _number(value, empty) for value in set(values)}
+        numbers = list(map(parsed.__getitem__, values))
+    np = numpy_module()
+    return numbers if np is None else np.array(numbers, dtype=np.float64)
+
+
+def project_columns(rows):
+    """{column: list of str} of the PROJECT_COLUMNS of dict rows"""
+    columns = {key: [] for key in PROJECT_COLUMNS}
+    appends = [(key, columns[key].append) for key in PROJECT_COLUMNS]
+    for row in rows:
+        for key, append in appends:
+            value = row.get(key)
+            append('' if value is None else str(value).strip())
+    return columns
+
+
+def read_columns(input_path, chunk_rows=CHUNK_ROWS):
+    """Project columns of a batch output CSV or store (.db)
+
+    CSV files are transposed chunk by chunk with csv.reader, without a
+    dict per row.
+    """
+    if input_path.lower().endswith('.db'):
+        return project_columns(iter_project(input_path))
+    columns = {key: [] for key in PROJECT_COLUMNS}
+    with gc_paused(), open_csv(input_path, 'r') as src:
+        reader = csv.reader(src)
+        header = [name.strip() for name in next(reader, [])]
+        width = len(header)
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            if set(map(len, chunk)) != {width}:
+                chunk = [(row + [''] * width)[:width] for row in chunk]
+            chunk_columns = dict(zip(header, zip(*chunk)))
+            for key, values in columns.items():
+                values.extend(chunk_columns.get(key) or [''] * len(chunk))
+    return columns
+
+
+def _categories(columns):
+    """Category of every row, defaulted like cable_batch.row_category"""
+    names = {category: category.strip().lower() for category in set(columns['category'])}
+    if '' not in names.values():
+        return list(map(names.__getitem__, columns['category']))
+    return [names[category] or ('feeder' if olt.strip() else 'cluster')
+            for category, olt in zip(columns['category'], columns['olt'])]
+
+
+def _name(columns, i, category):
+    name = columns['name'][i]
+    if name:
+        return name
+    if category == 'feeder':
+        return f"{columns['olt'][i]}/{columns['fdt'][i]}"
+    return f"{columns['fdt'][i]}/{columns['line'][i]}"
+
+
+class Reconciliation:
+    """Variances of the measured cables of a project, flagged first, then by |%|
+
+    Indexing and iterating yield Variance records, built on access so that
+    ranking a large project only sorts row indices.
+    """
+    def __init__(self, columns, categories, ranked, values, flagged, mean_pct):
+        self.columns = columns
+        self.categories = categories
+        self.ranked = ranked
+        self.values = values  # design, otdr, variance, variance_pct, flags per row
+        self.cables = len(categories)
+        self.measured = len(ranked)
+        self.flagged = flagged
+        self.mean_pct = mean_pct
+
+    def __len__(self):
+        return self.measured
+
+    def _variance(self, i):
+        design, otdr, variance, variance_pct, flags = self.values
+        category = self.categories[i]
+        return Variance(i + 1, _name(self.columns, i, category), category, design[i],
+                        otdr[i], variance[i], variance_pct[i], flags[i])
+
+    def __getitem__(self, rank):
+        return self._variance(self.ranked[rank])
+
+    def __iter__(self):
+        return map(self._variance, self.ranked)
+
+
+def reconcile(columns, pct=VARIANCE_PCT, meters=VARIANCE_M):
+    """Reconciliation of project columns (see project_columns and read_columns)
+
+    The design length is recomputed from route and slack with the length
+    formula of the active rule profile, in one vectorized pass. Cables
+    without an OTDR value (empty or 0), without a design length or with
+    an 'error' are counted but not ranked.
+    """
+    categories = _categories(columns)
+    route = _numbers(columns['route'])
+    fdt, fat = _numbers(columns['slack_fdt']), _numbers(columns['slack_fat'])
+    slack = _numbers(columns['slack'])
+    otdr = _numbers(columns['otdr'], math.nan)
+    errors = columns['error']
+
+    np = numpy_module()
+    if np is not None:
+        units = np.where(np.array(categories) == 'cluster', fdt + fat, slack)
+        valid = np.isfinite(route) & np.isfinite(units)
+        design = total_lengths(np.where(valid, route, 0.0), np.where(valid, units, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = otdr - design
+            variance_pct = variance / design * 100
+            measured = (otdr > 0) & (design > 0) & (np.array(errors) == '')
+            over = measured & (variance_pct > pct) & (variance > meters)
+            under = measured & (variance_pct < -pct) & (variance < -meters)
+        flagged = over | under
+        ranked = np.flatnonzero(measured)
+        ranked = ranked[np.lexsort((-np.abs(variance_pct[ranked]), ~flagged[ranked]))]
+        flags = np.where(over, 'over', np.where(under, 'under', ''))
+        mean = float(variance_pct[measured].mean()) if measured.any() else 0.0
+        design, otdr, variance, variance_pct = (design.tolist(), otdr.tolist(),
+                                                variance.tolist(), variance_pct.tolist())
+        ranked, flags, flagged = ranked.tolist(), flags.tolist(), int(flagged.sum())
+    else:
+        units = [a + b if c == 'cluster' else s
+                 for c, a, b, s in zip(categories, fdt, fat, slack)]
+        valid = [math.isfinite(r) and math.isfinite(u) for r, u in zip(route, units)]
+        design = total_lengths([r if ok else 0.0 for r, ok in zip(route, valid)],
+                               [u if ok else 0.0 for u, ok in zip(units, valid)])
+        variance, variance_pct = [math.nan] * len(route), [math.nan] * len(route)
+        flags, ranked, keys = [''] * len(route), [], {}
+        flagged = 0
+        total = 0.0
+        for i, (d, o, error) in enumerate(zip(design, otdr, errors)):
+            if not (o > 0 and d > 0) or error:
+                continue
+            variance[i] = v = o - d
+            variance_pct[i] = p = v / d * 100
+            if p > pct and v > meters:
+                flags[i] = 'over'
+            elif p < -pct and v < -meters:
+                flags[i] = 'under'
+            flagged += bool(flags[i])
+            total += p
+            ranked.append(i)
+            keys[i] = (not flags[i], -abs(p))
+        ranked.sort(key=keys.__getitem__)
+        mean = total / len(ranked) if ranked else 0.0
+
+    return Reconciliation(columns, categories, ranked,
+                          (design, otdr, variance, variance_pct, flags), flagged, mean)
+
+
+def run_reconcile(input_path, output_path='-', pct=VARIANCE_PCT, meters=VARIANCE_M,
+                  flagged_only=False):
+    """Write the ranked variance report of a project, return its Reconciliation"""
+    result = reconcile(read_columns(input_path), pct, meters)
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.writer(dst)
+        writer.writerow(REPORT_COLUMNS)
+        for rank, v in enumerate(result, 1):
+            if flagged_only and not v.flag:
+                break
+            writer.writerow([rank, v.row, v.name, v.category, f"{v.design:g}", f"{v.otdr:g}",
+                             f"{v.variance:+.1f}", f"{v.variance_pct:+.2f}", v.flag])
+    return result
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Compact Cable Records
+__slots__ records with interned codes for bulk cable naming
+"""
+
+from functools import lru_cache
+
+from cable_batch import row_category
+from cable_engine import active_profile
+
+PREFIX_CACHE_SIZE = 65536  # distinct name prefixes kept in the LRU
+LENGTH_MARK = '\0'  # stands in for the length when a name is split around it
+
+
+class CodePool:
+    """Interning table so repeated codes share one string object"""
+    def __init__(self):
+        self._codes = {}
+
+    def __len__(self):
+        return len(self._codes)
+
+    def intern(self, text):
+        text = (text or '').strip()
+        return self._codes.setdefault(text, text)
+
+    def clear(self):
+        self._codes.clear()
+
+
+DEFAULT_POOL = CodePool()
+
+
+@lru_cache(maxsize=PREFIX_CACHE_SIZE)
+def cluster_name_parts(profile, fdt, line, cable_type):
+    """Cluster name of a profile split around its length, e.g. ('FDT01 - ... - AE - ', ' M')"""
+    return tuple(profile.cluster_cable_name(fdt, line, cable_type, LENGTH_MARK)
+                 .split(LENGTH_MARK))
+
+
+@lru_cache(maxsize=PREFIX_CACHE_SIZE)
+def feeder_name_parts(profile, olt, fdt, feeder_type, cable_type):
+    """Feeder name of a profile split around its length"""
+    return tuple(profile.feeder_cable_name(olt, fdt, feeder_type, cable_type, LENGTH_MARK)
+                 .split(LENGTH_MARK))
+
+
+class CableRecord:
+    """One cable segment; codes are interned and the name parts are shared
+
+    The length (the OTDR text) is nearly unique per cable and is kept as
+    is, interning it would only grow the pool.
+
+    name matches cluster_cable_name / feeder_cable_name of the profile in
+    cable_engine (the active one by default).
+    """
+    __slots__ = ('category', 'olt', 'fdt', 'line', 'feeder_type', 'cable_type',
+                 'length', 'parts')
+
+    def __init__(self, category, fdt, cable_type, length='', olt='', line='',
+                 feeder_type='', pool=DEFAULT_POOL, profile=None):
+        intern = pool.intern
+        self.category = intern(category.lower())
+        self.olt = intern(olt)
+        self.fdt = intern(fdt)
+        self.line = intern(line)
+        self.feeder_type = intern(feeder_type)
+        self.cable_type = intern(cable_type)
+        self.length = (length or '').strip()
+        profile = profile or active_profile()
+        if self.category == 'cluster':
+            self.parts = cluster_name_parts(profile, self.fdt, self.line, self.cable_type)
+        elif self.category == 'feeder':
+            self.parts = feeder_name_parts(profile, self.olt, self.fdt, self.feeder_type,
+                                           self.cable_type)
+        else:
+            raise ValueError(f"unknown category '{category}'")
+
+    @property
+    def name(self):
+        return self.length.upper().join(self.parts)
+
+    def __repr__(self):
+        return f"CableRecord({self.name!r})"
+
+    @classmethod
+    def from_row(cls, row, pool=DEFAULT_POOL):
+        """Record from a batch CSV row (see cable_batch), length = OTDR"""
+        return cls(row_category(row), row.get('fdt'), row.get('cable_type') or '',
+                   row.get('otdr') or '', row.get('olt') or '', row.get('line') or '',
+                   row.get('feeder_type') or '', pool)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Result View
+Sorted and filtered window over a large array of generated results
+"""
+
+import csv
+import math
+
+from cable_batch import open_csv
+
+RESULT_COLUMNS = ('name', 'cable_type', 'total_length', 'otdr')
+
+
+def _number_key(text):
+    """Sort key that puts numbers in numeric order and blanks/text last"""
+    try:
+        return float(text)
+    except ValueError:
+        return math.inf
+
+
+class ResultView:
+    """Rows of RESULT_COLUMNS values with a sort order and a name filter
+
+    Only index lists are rebuilt on sort/filter; the rows themselves are
+    never copied, and each column's full sort permutation is computed once.
+    """
+    numeric = ('total_length', 'otdr')
+
+    def __init__(self, rows=()):
+        self.rows = [tuple(row) for row in rows]
+        self._lowered = None
+        self._sorted = {}
+        self.sort_column = None
+        self.reverse = False
+        self.filter_text = ''
+        self.order = range(len(self.rows))
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        return self.rows[self.order[index]]
+
+    def window(self, start, count):
+        """Visible rows start .. start + count"""
+        rows = self.rows
+        return [rows[i] for i in self.order[start:start + count]]
+
+    def records(self):
+        """Yield the rows in view order as dicts, for export"""
+        rows = self.rows
+        for i in self.order:
+            yield dict(zip(RESULT_COLUMNS, rows[i]))
+
+    def _key(self, column):
+        k = RESULT_COLUMNS.index(column)
+        if column in self.numeric:
+            return lambda row: _number_key(row[k])
+        return lambda row: row[k].lower()
+
+    def _permutation(self, column):
+        perm = self._sorted.get(column)
+        if perm is None:
+            keys = list(map(self._key(column), self.rows))
+            perm = self._sorted[column] = sorted(range(len(self.rows)), key=keys.__getitem__)
+        return perm
+
+    def sort(self, column, reverse=False):
+        """Sort by a column, the current filter is kept"""
+        self.sort_column = column
+        self.reverse = reverse
+        self._update()
+
+    def filter(self, text):
+        """Keep rows whose name contains text (case-insensitive)"""
+        self.filter_text = text.strip().lower()
+        self._update()
+
+    def _update(self):
+        column = self.sort_column
+        if self.filter_text:
+            if self._lowered is None:
+                self._lowered = [row[0].lower() for row in self.rows]
+            text = self.filter_text
+            lowered = self._lowered
+            order = self._sorted.get(column, range(len(self.rows)))
+            order = [i for i in order if text in lowered[i]]
+            if column is not None and column not in self._sorted:
+                # Few matches: sort them directly instead of the whole array
+                key = self._key(column)
+                rows = self.rows
+                order.sort(key=lambda i: key(rows[i]))
+        elif column is not None:
+            order = self._permutation(column)
+        else:
+            order = range(len(self.rows))
+        if column is not None and self.reverse:
+            order = order[::-1]
+        self.order = order
+
+    @classmethod
+    def from_rows(cls, rows):
+        """View over processed batch rows (see cable_batch.process_row)"""
+        return cls((row.get('name') or '',
+                    row.get('cable_type') or '',
+                    str(row.get('total_length') or ''),
+                    row.get('otdr') or '')
+                   for row in rows)
+
+    @classmethod
+    def from_csv(cls, path):
+        """View over a batch output CSV"""
+        with open_csv(path, 'r') as src:
+            reader = csv.reader(src)
+            header = next(reader, [])
+            index = [header.index(column) if column in header else None
+                     for column in RESULT_COLUMNS]
+            if None in index:
+                return cls.from_rows(csv.DictReader(src, header))
+            a, b, c, d = index
+            return cls((row[a], row[b], row[c], row[d]) for row in reader)
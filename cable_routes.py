@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Route Import
+Streams cable polylines and FDT/FAT points from KML/GeoJSON exports
+"""
+
+import json
+import math
+import os
+from collections import namedtuple
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+
+# NumPy is optional, lengths fall back to a per-segment loop without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS = 6371008.8      # mean earth radius (m), haversine
+WGS84_A = 6378137.0           # WGS84 semi-major axis (m), Vincenty
+WGS84_F = 1 / 298.257223563   # WGS84 flattening
+
+READ_SIZE = 1024 * 1024       # bytes per read when streaming GeoJSON
+BATCH_SIZE = 10000            # routes per vectorized length pass
+
+# name: route name, parts: list of polylines, each a list of (lon, lat)
+Route = namedtuple('Route', ['name', 'parts'])
+# kind: 'fdt', 'fat' or None (see point_kind)
+Point = namedtuple('Point', ['name', 'kind', 'lon', 'lat'])
+
+# One map feature: lines are polylines, points are (lon, lat) pairs
+Feature = namedtuple('Feature', ['name', 'props', 'lines', 'points'])
+
+
+# ---------------------------------------------------------------------------
+# KML
+# ---------------------------------------------------------------------------
+
+def _local(tag):
+    """Tag name without XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _kml_coords(text):
+    """Parse a KML coordinates string into (lon, lat) pairs"""
+    coords = []
+    for point in (text or '').split():
+        values = point.split(',')
+        coords.append((float(values[0]), float(values[1])))
+    return coords
+
+
+def iter_kml_features(path):
+    """Yield a Feature for every Placemark"""
+    stack = []
+    name, props, lines, points = None, {}, [], []
+    for event, elem in iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if _local(elem.tag) == 'Placemark':
+                name = None
+                props = {}
+                lines = []
+                points = []
+            continue
+
+        stack.pop()
+        tag = _local(elem.tag)
+        if tag == 'name' and name is None:
+            name = (elem.text or '').strip()
+        elif tag in ('Data', 'SimpleData'):
+            # ExtendedData <Data name=".."><value>..</value></Data> / <SimpleData name="..">
+            value = elem.text if tag == 'SimpleData' else next(
+                (child.text for child in elem if _local(child.tag) == 'value'), None)
+            props[elem.get('name')] = (value or '').strip()
+        elif tag in ('LineString', 'Point'):
+            for child in elem:
+                if _local(child.tag) == 'coordinates':
+                    coords = _kml_coords(child.text)
+                    if tag == 'LineString':
+                        lines.append(coords)
+                    else:
+                        points.extend(coords)
+        elif tag == 'Placemark':
+            yield Feature(name, props, lines, points)
+            # Detach finished placemarks so the tree never grows
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+
+
+# ---------------------------------------------------------------------------
+# GeoJSON
+# ---------------------------------------------------------------------------
+
+def _iter_json_features(f):
+    """Incrementally decode the items of the "features" array"""
+    decoder = json.JSONDecoder()
+    buf = ''
+    eof = False
+
+    def fill():
+        nonlocal buf, eof
+        chunk = f.read(READ_SIZE)
+        if chunk:
+            buf += chunk
+        else:
+            eof = True
+
+    # Locate the features array, small documents without one are loaded whole
+    while True:
+        key = buf.find('"features"')
+        start = buf.find('[', key) if key >= 0 else -1
+        if start >= 0:
+            pos = start + 1
+            break
+        if eof:
+            doc = json.loads(buf)
+            yield from doc.get('features', [doc]) if isinstance(doc, dict) else doc
+            return
+        fill()
+
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("unterminated GeoJSON features array")
+            buf = ''
+            pos = 0
+            fill()
+            continue
+        if buf[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            buf = buf[pos:]
+            pos = 0
+            fill()
+            continue
+        yield item
+        pos = end
+
+
+def _iter_jsonseq_features(f):
+    """Decode newline-delimited GeoJSON (GeoJSONSeq / NDJSON)"""
+    for line in f:
+        line = line.strip().lstrip('\x1e')
+        if line:
+            yield json.loads(line)
+
+
+def _geometry_coords(geometry, lines, points):
+    """Collect polylines and points of a GeoJSON geometry"""
+    gtype = geometry.get('type')
+    coords = geometry.get('coordinates') or []
+    if gtype == 'LineString':
+        lines.append([(float(c[0]), float(c[1])) for c in coords])
+    elif gtype == 'MultiLineString':
+        lines.extend([(float(c[0]), float(c[1])) for c in line] for line in coords)
+    elif gtype == 'Point' and coords:
+        points.append((float(coords[0]), float(coords[1])))
+    elif gtype == 'MultiPoint':
+        points.extend((float(c[0]), float(c[1])) for c in coords)
+    elif gtype == 'GeometryCollection':
+        for g in geometry.get('geometries') or []:
+            _geometry_coords(g, lines, points)
+
+
+def iter_geojson_features(path):
+    """Yield a Feature for every GeoJSON feature"""
+    seq = os.path.splitext(path)[1].lower() in ('.geojsonl', '.geojsons', '.jsonl', '.ndjson')
+    with open(path, encoding='utf-8-sig') as f:
+        features = _iter_jsonseq_features(f) if seq else _iter_json_features(f)
+        for feature in features:
+            lines, points = [], []
+            _geometry_coords(feature.get('geometry') or feature, lines, points)
+            props = feature.get('properties') or {}
+            name = props.get('name') or props.get('Name') or feature.get('id')
+            yield Feature(str(name) if name is not None else None, props, lines, points)
+
+
+def iter_features(path):
+    """Stream features from a .kml or GeoJSON file"""
+    if os.path.splitext(path)[1].lower() == '.kml':
+        return iter_kml_features(path)
+    return iter_geojson_features(path)
+
+
+def load_routes(path):
+    """Stream a Route for every feature holding polylines"""
+    count = 0
+    for feature in iter_features(path):
+        if feature.lines:
+            count += 1
+            yield Route(feature.name or f"route-{count}", feature.lines)
+
+
+def point_kind(name, props=None):
+    """Classify a point as 'fdt' / 'fat' by its type property or name prefix"""
+    props = props or {}
+    for value in (props.get('type'), props.get('kind'), name):
+        value = str(value or '').strip().upper()
+        if value.startswith('FDT'):
+            return 'fdt'
+        if value.startswith('FAT'):
+            return 'fat'
+    return None
+
+
+def load_points(path):
+    """Stream a Point for every point feature"""
+    for feature in iter_features(path):
+        kind = point_kind(feature.name, feature.props)
+        for lon, lat in feature.points:
+            yield Point(feature.name, kind, lon, lat)
+
+
+# ---------------------------------------------------------------------------
+# Length
+# ---------------------------------------------------------------------------
+
+def haversine_distance(lon1, lat1, lon2, lat2):
+    """Great-circle distance in meters between two points"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def vincenty_distance(lon1, lat1, lon2, lat2, max_iter=200, tol=1e-12):
+    """Ellipsoidal (WGS84) distance in meters, Vincenty inverse formula"""
+    if lon1 == lon2 and lat1 == lat2:
+        return 0.0
+    b = WGS84_A * (1 - WGS84_F)
+    L = math.radians(lon2 - lon1)
+    U1 = math.atan((1 - WGS84_F) * math.tan(math.radians(lat1)))
+    U2 = math.atan((1 - WGS84_F) * math.tan(math.radians(lat2)))
+    sinU1, cosU1 = math.sin(U1), math.cos(U1)
+    sinU2, cosU2 = math.sin(U2), math.cos(U2)
+
+    lam = L
+    for _ in range(max_iter):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+        if sin_sigma == 0:
+            return 0.0
+        cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cosU1 * cosU2 * sin_lam / sin_sigma
+        cos2_alpha = 1 - sin_alpha ** 2
+        cos_2sm = cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha if cos2_alpha else 0.0
+        C = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+        lam_prev = lam
+        lam = L + (1 - C) * WGS84_F * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+        if abs(lam - lam_prev) < tol:
+            break
+    else:
+        # Nearly antipodal points do not converge, haversine is close enough
+        return haversine_distance(lon1, lat1, lon2, lat2)
+
+    u2 = cos2_alpha * (WGS84_A ** 2 - b ** 2) / b ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sm ** 2)
+        - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+    return b * A * (sigma - delta_sigma)
+
+
+def polyline_length(coords, method='haversine'):
+    """Length in meters of one polyline"""
+    distance = vincenty_distance if method == 'vincenty' else haversine_distance
+    return sum(distance(lon1, lat1, lon2, lat2)
+               for (lon1, lat1), (lon2, lat2) in zip(coords, coords[1:]))
+
+
+def _haversine_lengths(routes):
+    """Vectorized haversine over every vertex of a batch of routes"""
+    lons, lats, starts, owner = [], [], [], []
+    for i, route in enumerate(routes):
+        for part in route.parts:
+            starts.append(len(lons))
+            owner.append(i)
+            for lon, lat in part:
+                lons.append(lon)
+                lats.append(lat)
+    if len(lons) < 2:
+        return np.zeros(len(routes))
+
+    lon = np.radians(np.asarray(lons))
+    lat = np.radians(np.asarray(lats))
+    dlat = lat[1:] - lat[:-1]
+    dlon = lon[1:] - lon[:-1]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    seg = 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    # Drop the segments that join the end of one part to the start of the next
+    seg_owner = np.full(len(seg), -1)
+    starts.append(len(lons))
+    for part_start, part_end, i in zip(starts, starts[1:], owner):
+        seg_owner[part_start:part_end - 1] = i
+    valid = seg_owner >= 0
+    return np.bincount(seg_owner[valid], weights=seg[valid], minlength=len(routes))
+
+
+def iter_route_lengths(routes, method='haversine', batch_size=BATCH_SIZE):
+    """Yield (name, length in meters) for a stream of routes"""
+    routes = iter(routes)
+    while True:
+        batch = list(islice(routes, batch_size))
+        if not batch:
+            return
+        if np is not None and method == 'haversine':
+            lengths = _haversine_lengths(batch).tolist()
+        else:
+            lengths = [sum(polyline_length(part, method) for part in route.parts)
+                       for route in batch]
+        yield from zip((route.name for route in batch), lengths)
+
+
+def route_lengths(path, method='haversine'):
+    """Map of route name to length in meters for a KML/GeoJSON file"""
+    return dict(iter_route_lengths(load_routes(path), method))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Cable Type Selection
+Picks the smallest cluster/feeder cable type per segment of an OLT -> FDT -> line -> FAT tree
+"""
+
+import csv
+import math
+from bisect import bisect_left
+
+from cable_batch import open_csv
+from cable_engine import (active_profile, parse_cable_type, cluster_cable_name,
+                          feeder_cable_name)
+
+SEGMENT_COLUMNS = ['level', 'olt', 'fdt', 'line', 'demand', 'cores', 'cable_type', 'name', 'error']
+
+
+class TypeTable:
+    """Cable types sorted by core count for O(log n) smallest-fit lookup"""
+    def __init__(self, cable_types):
+        pairs = sorted((parse_cable_type(t)[0], t) for t in cable_types)
+        self.cores = [cores for cores, _ in pairs]
+        self.types = [t for _, t in pairs]
+
+    def smallest(self, cores_needed):
+        """Smallest type with at least cores_needed cores, None if too big"""
+        i = bisect_left(self.cores, cores_needed)
+        return self.types[i] if i < len(self.types) else None
+
+
+class _Node:
+    __slots__ = ('code', 'children', 'demand', 'attrs')
+
+    def __init__(self, code):
+        self.code = code
+        self.children = {}
+        self.demand = 0
+        self.attrs = {}
+
+    def child(self, code):
+        node = self.children.get(code)
+        if node is None:
+            node = self.children[code] = _Node(code)
+        return node
+
+    def set_attrs(self, row, keys):
+        """Keep the first non-empty value of each attribute"""
+        for key in keys:
+            if key not in self.attrs:
+                value = (row.get(key) or '').strip()
+                if value:
+                    self.attrs[key] = value
+
+
+def _demand(text):
+    """Cores demanded by a FAT, empty counts as 1"""
+    text = text.strip()
+    if not text:
+        return 1
+    if not text.isdigit():
+        raise ValueError(f"invalid demand '{text}', expected a whole number of cores")
+    return int(text)
+
+
+def build_tree(rows, errors=None):
+    """Build the OLT -> FDT -> line -> FAT tree from one row per FAT
+
+    Rows are dicts with olt, fdt, line, fat, demand (cores, default 1) and
+    optional feeder_type / feeder_length (FDT) and cluster_length (line).
+    Rows with an invalid demand are left out of the tree; with an errors
+    list they are appended to it as 'fat' segment dicts, otherwise the
+    ValueError is raised.
+    """
+    root = _Node(None)
+    for number, row in enumerate(rows, 1):
+        get = row.get
+        try:
+            demand = _demand(get('demand') or '')
+        except ValueError as e:
+            if errors is None:
+                raise
+            errors.append({'level': 'fat', 'olt': (get('olt') or '').strip(),
+                           'fdt': (get('fdt') or '').strip(),
+                           'line': (get('line') or '').strip(),
+                           'error': f"row {number}: {e}"})
+            continue
+        fdt = root.child((get('olt') or '').strip()).child((get('fdt') or '').strip())
+        line = fdt.child((get('line') or '').strip())
+        fat = line.child((get('fat') or '').strip())
+        fdt.set_attrs(row, ('feeder_type', 'feeder_length'))
+        line.set_attrs(row, ('cluster_length',))
+        fat.demand += demand
+    return root
+
+
+def solve(root, spare=0.0, split_ratio=1, cluster_types=None, feeder_types=None):
+    """Yield one segment dict per feeder (OLT -> FDT) and cluster line
+
+    Demand is summed bottom-up in a single post-order pass; a line needs
+    its FATs' cores, a feeder needs ceil(line demand / split_ratio).
+    spare adds headroom (0.2 = 20%) before picking the smallest type.
+    The cable types default to those of the active rule profile.
+    """
+    if split_ratio < 1:
+        raise ValueError("split_ratio must be at least 1")
+    if not spare >= 0:
+        raise ValueError("spare must be a fraction >= 0")
+    profile = active_profile()
+    cluster_table = TypeTable(cluster_types or profile.cluster_cable_types)
+    feeder_table = TypeTable(feeder_types or profile.feeder_cable_types)
+
+    def segment(level, olt, fdt, line, demand, table, attrs):
+        cores = math.ceil(demand * (1 + spare))
+        ctype = table.smallest(cores)
+        seg = {'level': level, 'olt': olt.code, 'fdt': fdt.code,
+               'line': line.code if line else '', 'demand': demand, 'cores': cores,
+               'cable_type': ctype or '', 'name': '', 'error': ''}
+        if ctype is None:
+            seg['error'] = f"{cores} cores exceed largest {level} cable {table.types[-1]}"
+        elif level == 'cluster':
+            seg['name'] = cluster_cable_name(fdt.code, line.code, ctype,
+                                             attrs.get('cluster_length', ''))
+        else:
+            seg['name'] = feeder_cable_name(olt.code, fdt.code,
+                                            attrs.get('feeder_type') or profile.feeder_types[0],
+                                            ctype, attrs.get('feeder_length', ''))
+        return seg
+
+    for olt in root.children.values():
+        for fdt in olt.children.values():
+            lines = []
+            for line in fdt.children.values():
+                line.demand = sum(fat.demand for fat in line.children.values())
+                lines.append(segment('cluster', olt, fdt, line, line.demand,
+                                     cluster_table, line.attrs))
+            fdt.demand = math.ceil(sum(line.demand for line in fdt.children.values())
+                                   / split_ratio)
+            if olt.code:
+                yield segment('feeder', olt, fdt, None, fdt.demand, feeder_table, fdt.attrs)
+            yield from lines
+            olt.demand += fdt.demand
+
+
+def run_selection(input_path, output_path='-', spare=0.0, split_ratio=1):
+    """Select cable types for a CSV of FATs, return (segments, rows with errors)
+
+    Rows with an invalid demand are written first, with their error.
+    """
+    count = 0
+    errors = []
+    with open_csv(input_path, 'r') as src:
+        root = build_tree(csv.DictReader(src), errors)
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.DictWriter(dst, SEGMENT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(errors)
+        for seg in solve(root, spare, split_ratio):
+            writer.writerow(seg)
+            count += 1
+    return count, len(errors)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - JSON API
+Local asyncio HTTP/JSON server for cable names, descriptions and batches
+"""
+
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qsl, urlsplit
+
+from cable_batch import process_row, row_category
+from cable_engine import (parse_number, total_length, cluster_cable_name, feeder_cable_name,
+                          cluster_description, feeder_description)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+KEEPALIVE_TIMEOUT = 15.0  # seconds an idle connection is kept open
+MAX_BODY = 16 * 1024 * 1024  # bytes per request body
+MAX_HEADERS = 100
+LINE_LIMIT = 64 * 1024  # bytes per request or header line (StreamReader limit)
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 414: 'URI Too Long',
+           431: 'Request Header Fields Too Large'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _field(params, key):
+    return str(params.get(key) or '').strip()
+
+
+def cable_name(params):
+    """{"name"} of a cluster or feeder cable, params use batch column names"""
+    category = row_category(params)
+    if category == 'cluster':
+        name = cluster_cable_name(_field(params, 'fdt'), _field(params, 'line'),
+                                  _field(params, 'cable_type'), _field(params, 'otdr'))
+    elif category == 'feeder':
+        name = feeder_cable_name(_field(params, 'olt'), _field(params, 'fdt'),
+                                 _field(params, 'feeder_type'), _field(params, 'cable_type'),
+                                 _field(params, 'otdr'))
+    else:
+        raise ValueError(f"unknown category '{category}'")
+    return {'name': name}
+
+
+def cluster(params):
+    """{"total_length", "description"} of a cluster cable"""
+    route = parse_number(_field(params, 'route'))
+    fdt = parse_number(_field(params, 'slack_fdt'))
+    fat = parse_number(_field(params, 'slack_fat'))
+    return {'total_length': total_length(route, fdt + fat)[1],
+            'description': cluster_description(route, fdt, fat, _field(params, 'otdr') or '0')}
+
+
+def feeder(params):
+    """{"total_length", "description"} of a feeder cable"""
+    route = parse_number(_field(params, 'route'))
+    slack = parse_number(_field(params, 'slack'))
+    return {'total_length': total_length(route, slack)[1],
+            'description': feeder_description(route, slack, _field(params, 'otdr') or '0')}
+
+
+def batch(params):
+    """{"rows"}: every row run through the batch pipeline, errors stay per row"""
+    rows = params.get('rows') if isinstance(params, dict) else params
+    if not isinstance(rows, list):
+        raise ValueError("expected a JSON list of rows or {\"rows\": [...]}")
+    return {'rows': [process_row({key: '' if value is None else str(value)
+                                  for key, value in row.items()})
+                     for row in rows]}
+
+
+ROUTES = {
+    '/name': cable_name,
+    '/cluster': cluster,
+    '/feeder': feeder,
+    '/batch': batch,
+    '/health': lambda params: {'status': 'ok'},
+}
+
+
+def handle(method, target, body):
+    """Dispatch one request, return (status, JSON-able payload)"""
+    url = urlsplit(target)
+    endpoint = ROUTES.get(url.path.rstrip('/') or '/')
+    if endpoint is None:
+        raise HTTPError(404, f"unknown endpoint '{url.path}'")
+    if method not in ('GET', 'POST'):
+        raise HTTPError(405, f"method {method} not allowed")
+
+    params = dict(parse_qsl(url.query))
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+        if isinstance(data, dict) and endpoint is not batch:
+            params.update(data)
+        else:
+            params = data
+    try:
+        return 200, endpoint(params)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPError(400, str(e))
+
+
+async def _readline(reader, status, what):
+    """One line, HTTPError(status) when it is longer than LINE_LIMIT"""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # readline() reports a LimitOverrunError as ValueError
+        raise HTTPError(status, f"{what} longer than {LINE_LIMIT} bytes") from None
+
+
+async def _read_request(reader):
+    """(method, target, version, headers, body), None once the client is gone"""
+    line = await asyncio.wait_for(_readline(reader, 414, "request line"), KEEPALIVE_TIMEOUT)
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await _readline(reader, 431, "header line")
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(400, "too many headers")
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(400, "chunked request bodies are not supported")
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, version.upper(), headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def handle_connection(reader, writer):
+    """Serve requests on one connection until it closes or idles out"""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except HTTPError as e:
+                writer.write(_response(e.status, {'error': str(e)}, False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, target, version, headers, body = request
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                          else connection == 'keep-alive')
+            try:
+                status, payload = handle(method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {'error': str(e)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    """Run the server until cancelled, ready(server) is called once listening"""
+    server = await asyncio.start_server(handle_connection, host, port, limit=LINE_LIMIT)
+    if ready:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Blocking entry point for --serve"""
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Serving on http://{address[0]}:{address[1]}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
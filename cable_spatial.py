@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Spatial Index
+Uniform grid over FDT/FAT points for automatic slack counting
+"""
+
+import math
+from collections import defaultdict
+
+from cable_routes import EARTH_RADIUS
+
+SNAP_TOLERANCE = 10.0  # meters between a point and a route to count as slack
+
+
+class PointGrid:
+    """Uniform grid of points in a local equirectangular projection (meters)"""
+    def __init__(self, points, cell_size=None, tolerance=SNAP_TOLERANCE):
+        self.points = list(points)
+        self.tolerance = tolerance
+        self.cell_size = cell_size or max(8 * tolerance, 1.0)
+
+        lat0 = (sum(p.lat for p in self.points) / len(self.points)) if self.points else 0.0
+        self.kx = math.radians(1) * EARTH_RADIUS * math.cos(math.radians(lat0))
+        self.ky = math.radians(1) * EARTH_RADIUS
+
+        self.xy = [self.project(p.lon, p.lat) for p in self.points]
+        self.cells = defaultdict(list)
+        for i, (x, y) in enumerate(self.xy):
+            self.cells[self._cell(x, y)].append(i)
+
+    def project(self, lon, lat):
+        """Local x/y in meters"""
+        return lon * self.kx, lat * self.ky
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _segment_cells(self, ax, ay, bx, by, tol):
+        """Grid cells within tol of a segment, long segments are walked in steps"""
+        cells = set()
+        steps = max(1, int(math.hypot(bx - ax, by - ay) // self.cell_size) + 1)
+        for k in range(steps):
+            t0, t1 = k / steps, (k + 1) / steps
+            x0, x1 = ax + (bx - ax) * t0, ax + (bx - ax) * t1
+            y0, y1 = ay + (by - ay) * t0, ay + (by - ay) * t1
+            cx0, cy0 = self._cell(min(x0, x1) - tol, min(y0, y1) - tol)
+            cx1, cy1 = self._cell(max(x0, x1) + tol, max(y0, y1) + tol)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    cells.add((cx, cy))
+        return cells
+
+    def near_polyline(self, coords, tolerance=None):
+        """Indices of points within tolerance (m) of a (lon, lat) polyline"""
+        tol = self.tolerance if tolerance is None else tolerance
+        tol2 = tol * tol
+        found = set()
+        if not self.points or not coords:
+            return found
+
+        xy = [self.project(lon, lat) for lon, lat in coords]
+        if len(xy) == 1:
+            xy.append(xy[0])
+
+        for (ax, ay), (bx, by) in zip(xy, xy[1:]):
+            dx, dy = bx - ax, by - ay
+            seg2 = dx * dx + dy * dy
+            for cell in self._segment_cells(ax, ay, bx, by, tol):
+                for i in self.cells.get(cell, ()):
+                    if i in found:
+                        continue
+                    px, py = self.xy[i]
+                    # Distance from the point to the closest spot on the segment
+                    t = 0.0 if seg2 == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg2))
+                    ex, ey = ax + t * dx - px, ay + t * dy - py
+                    if ex * ex + ey * ey <= tol2:
+                        found.add(i)
+        return found
+
+    def count_kinds(self, parts, tolerance=None):
+        """Count snapped points per kind over all polylines of a route"""
+        found = set()
+        for part in parts:
+            found |= self.near_polyline(part, tolerance)
+        counts = defaultdict(int)
+        for i in found:
+            counts[self.points[i].kind] += 1
+        return counts
+
+
+def count_slack(routes, points, tolerance=SNAP_TOLERANCE):
+    """Yield (route name, slack FDT units, slack FAT units) for each route"""
+    grid = PointGrid((p for p in points if p.kind in ('fdt', 'fat')), tolerance=tolerance)
+    for route in routes:
+        counts = grid.count_kinds(route.parts)
+        yield route.name, counts['fdt'], counts['fat']
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Project Store
+SQLite store of generated cable names and descriptions with indexed lookup
+"""
+
+import csv
+import os
+import sqlite3
+import time
+from itertools import islice
+
+from cable_batch import open_csv, row_category
+
+BATCH_ROWS = 50000  # rows per write transaction
+
+STORE_COLUMNS = ['category', 'olt', 'fdt', 'line', 'feeder_type', 'cable_type', 'route',
+                 'slack_fdt', 'slack_fat', 'slack', 'otdr', 'name', 'total_length',
+                 'description']
+SEGMENT_COLUMNS = ['category', 'olt', 'fdt', 'line']  # one stored row per segment
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cables (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    olt TEXT NOT NULL, fdt TEXT NOT NULL, line TEXT NOT NULL,
+    feeder_type TEXT, cable_type TEXT,
+    route TEXT, slack_fdt TEXT, slack_fat TEXT, slack TEXT, otdr TEXT,
+    name TEXT, total_length TEXT, description TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (category, olt, fdt, line)
+);
+CREATE INDEX IF NOT EXISTS idx_cables_name ON cables (name);
+CREATE INDEX IF NOT EXISTS idx_cables_olt ON cables (olt);
+CREATE INDEX IF NOT EXISTS idx_cables_fdt_line ON cables (fdt, line);
+"""
+
+_INSERT = f"INSERT INTO cables ({', '.join(STORE_COLUMNS)}, updated) "
+_ON_SEGMENT = (
+    f"ON CONFLICT ({', '.join(SEGMENT_COLUMNS)}) DO UPDATE SET "
+    + ', '.join(f"{c} = excluded.{c}"
+                for c in STORE_COLUMNS[len(SEGMENT_COLUMNS):] + ['updated']))
+_UPSERT = _INSERT + f"VALUES ({', '.join('?' * (len(STORE_COLUMNS) + 1))}) " + _ON_SEGMENT
+
+# Stores written before rows were keyed by segment had a unique name 'key'
+# column; they are rebuilt once, the latest row of a segment wins
+_MIGRATE = f"""
+BEGIN;
+ALTER TABLE cables RENAME TO cables_by_name;
+DROP INDEX IF EXISTS idx_cables_name;
+DROP INDEX IF EXISTS idx_cables_olt;
+DROP INDEX IF EXISTS idx_cables_fdt_line;
+{_SCHEMA}
+{_INSERT}
+SELECT {', '.join(map("COALESCE({}, '')".format, STORE_COLUMNS))}, updated
+FROM cables_by_name WHERE true ORDER BY id
+{_ON_SEGMENT};
+DROP TABLE cables_by_name;
+COMMIT;
+"""
+
+
+class ProjectStore:
+    """Generated cables, one row per segment (category, OLT, FDT and line)
+
+    Saving a segment again replaces its row. Names are not unique: two
+    segments that generate the same name are both kept, so duplicate
+    detection can find them. The database runs in WAL mode so readers
+    never wait on a bulk write; rows are written in one transaction per
+    BATCH_ROWS. Indexes on name, OLT and (FDT, line) keep lookups and
+    per-FDT listings to index seeks.
+    """
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        if 'key' in [column[1] for column in self.db.execute("PRAGMA table_info(cables)")]:
+            self.db.executescript(_MIGRATE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _values(row, now):
+        values = ['' if row.get(key) is None else str(row.get(key)).strip()
+                  for key in STORE_COLUMNS]
+        values[0] = row_category(row)
+        if not (values[STORE_COLUMNS.index('name')]
+                or values[STORE_COLUMNS.index('description')]):
+            raise ValueError("cable has neither name nor description")
+        return values + [now]
+
+    def save_many(self, rows, batch_size=BATCH_ROWS):
+        """Upsert dict rows (batch columns), return the number saved
+
+        Rows with an 'error' are skipped.
+        """
+        count = 0
+        rows = (row for row in rows if not row.get('error'))
+        while True:
+            now = time.time()
+            batch = [self._values(row, now) for row in islice(rows, batch_size)]
+            if not batch:
+                return count
+            with self.db:
+                self.db.executemany(_UPSERT, batch)
+            count += len(batch)
+
+    def save(self, **fields):
+        """Upsert one generated result"""
+        self.save_many([fields])
+
+    def import_csv(self, path):
+        """Save a batch output CSV, return the number of rows saved"""
+        with open_csv(path, 'r') as src:
+            return self.save_many(csv.DictReader(src))
+
+    def find(self, name):
+        """First stored cable with this name (case-insensitive), None if unknown"""
+        row = self.db.execute("SELECT * FROM cables WHERE name = ? ORDER BY id LIMIT 1",
+                              (name.strip().upper(),)).fetchone()
+        return dict(row) if row else None
+
+    def cables(self, olt=None, fdt=None, line=None):
+        """Stored cables under an OLT / FDT / line, ordered by name"""
+        where, params = [], []
+        for column, value in (('olt', olt), ('fdt', fdt), ('line', line)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value.strip())
+        sql = "SELECT * FROM cables"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return [dict(row) for row in self.db.execute(sql + " ORDER BY name", params)]
+
+    def __iter__(self):
+        """Every stored cable as a dict, streamed in insertion order"""
+        for row in self.db.execute("SELECT * FROM cables ORDER BY id"):
+            yield dict(row)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM cables").fetchone()[0]
+
+
+def write_cables(rows, output_path='-'):
+    """Write stored cable dicts as CSV, return row count"""
+    with open_csv(output_path, 'w') as dst:
+        writer = csv.DictWriter(dst, STORE_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EMR Cable Generator - Validation
+Precompiled code patterns and range checks for GUI fields and bulk batch input
+"""
+
+import csv
+import json
+import re
+from collections import namedtuple
+from itertools import compress, count, islice
+
+from cable_batch import gc_paused, open_csv, row_category
+from cable_engine import active_profile
+
+CHUNK_ROWS = 100000  # rows validated per columnar pass
+REPORT_COLUMNS = ['row', 'field', 'value', 'error']
+
+# Codes are matched case-insensitively (names are upper-cased) after stripping.
+# Ranges are inclusive; empty values are only reported when required. The
+# feeder_type and cable_type choices come from the rule profile.
+DEFAULT_RULES = {
+    'patterns': {
+        'olt': r'[A-Z0-9][A-Z0-9_.-]{0,31}',
+        'fdt': r'[A-Z0-9][A-Z0-9_.-]{0,31}',
+        'line': r'[A-Z0-9][A-Z0-9_-]{0,7}',
+    },
+    'ranges': {
+        'route': [0, 100000],
+        'otdr': [0, 100000],
+        'slack_fdt': [0, 100],
+        'slack_fat': [0, 100],
+        'slack': [0, 100],
+    },
+    'choices': {
+        'category': ['cluster', 'feeder'],
+    },
+    'required': {
+        'cluster': ['fdt', 'line', 'cable_type'],
+        'feeder': ['olt', 'fdt', 'feeder_type', 'cable_type'],
+    },
+}
+
+# One validation problem; row is the 1-based data row (0 for single GUI checks)
+Issue = namedtuple('Issue', ['row', 'field', 'value', 'message'])
+
+
+def _pattern_check(field, pattern):
+    if not isinstance(pattern, str):
+        raise ValueError(f"rules pattern {field} must be a string")
+    try:
+        match = re.compile(pattern, re.IGNORECASE).fullmatch
+    except re.error as e:
+        raise ValueError(f"rules pattern {field}: {e}") from None
+
+    def check(value):
+        if match(value.strip()) is None:
+            return f"does not match {pattern}"
+    return check
+
+
+def _range_check(low, high):
+    def check(value):
+        try:
+            number = float(value)
+        except ValueError:
+            return "not a number"
+        # NaN fails both comparisons and is rejected with out-of-range values
+        if not low <= number <= high:
+            return f"out of range {low:g}..{high:g}"
+    return check
+
+
+def _bounds(field, bounds):
+    """(low, high) floats of a range rule"""
+    try:
+        if not isinstance(bounds, (list, tuple)):
+            raise TypeError
+        low, high = map(float, bounds)
+    except (TypeError, ValueError):
+        raise ValueError(f"rules range {field} must be a [low, high] pair of numbers") from None
+    if not low <= high:
+        raise ValueError(f"rules range {field} must have low <= high")
+    return low, high
+
+
+def _names(key, values):
+    """List of the strings of a choices or required rule"""
+    if not (isinstance(values, (list, tuple))
+            and all(isinstance(value, str) for value in values)):
+        raise ValueError(f"rules {key} must be a list of strings")
+    return list(values)
+
+
+def _choice_check(choices):
+    allowed = frozenset(choice.upper() for choice in choices)
+    listed = ', '.join(choices)
+
+    def check(value):
+        if value.strip().upper() not in allowed:
+            return f"not one of {listed}"
+    return check
+
+
+class Validator:
+    """Field checks compiled once from a rules dict (see DEFAULT_RULES)
+
+    rules only needs the sections and fields it changes, everything else
+    comes from DEFAULT_RULES and the types of profile (a cable_engine
+    Profile, the active one by default). Bulk checks run per column on the
+    distinct values of a chunk, so codes repeated over many rows are
+    checked once.
+    """
+    def __init__(self, rules=None, profile=None):
+        profile = profile or active_profile()
+        if rules is not None and not isinstance(rules, dict):
+            raise ValueError("rules must be an object of sections")
+        self.rules = {section: dict(values) for section, values in DEFAULT_RULES.items()}
+        self.rules['choices'].update(feeder_type=profile.feeder_types,
+                                     cable_type=profile.cable_types)
+        for section, values in (rules or {}).items():
+            if section not in self.rules:
+                raise ValueError(f"unknown rules section '{section}'")
+            if not isinstance(values, dict):
+                raise ValueError(f"rules {section} must be an object of fields")
+            self.rules[section].update(values)
+
+        self.checks = {}
+        for field, pattern in self.rules['patterns'].items():
+            self.checks[field] = _pattern_check(field, pattern)
+        for field, bounds in self.rules['ranges'].items():
+            self.checks[field] = _range_check(*_bounds(field, bounds))
+        for field, choices in self.rules['choices'].items():
+            self.checks[field] = _choice_check(_names(f"choices {field}", choices))
+        self.required = {category: tuple(_names(f"required {category}", fields))
+                         for category, fields in self.rules['required'].items()}
+
+    def check(self, field, value):
+        """Error message for one non-empty value, None if it is valid"""
+        check = self.checks.get(field)
+        if check is None or value is None or not str(value).strip():
+            return None
+        return check(str(value))
+
+    def check_fields(self, fields, category=None):
+        """{field: message} for a dict of field values, required by category"""
+        problems = {}
+        for field in self.required.get(category, ()):
+            if not str(fields.get(field) or '').strip():
+                problems[field] = "required"
+        for field, value in fields.items():
+            if field not in problems:
+                message = self.check(field, value)
+                if message:
+                    problems[field] = message
+        return problems
+
+    def check_row(self, row, number=0):
+        """Issues of one batch row dict"""
+        category = row_category(row)
+        return [Issue(number, field, row.get(field) or '', message)
+                for field, message in self.check_fields(row, category).items()]
+
+    def check_columns(self, columns, start=1):
+        """Issues of a chunk given as {field: sequence of str}, ordered by row
+
+        start is the row number of the first value.
+        """
+        issues = []
+        distinct = {}
+        for field, values in columns.items():
+            check = self.checks.get(field)
+            if check is None or self._numbers_in_range(field, values):
+                continue
+            distinct[field] = unique = set(values)
+            bad = {}
+            for value in unique:
+                if value and not value.isspace():
+                    message = check(value)
+                    if message:
+                        bad[value] = message
+            if bad:
+                issues.extend(Issue(i, field, value, bad[value])
+                              for i, value in enumerate(values, start) if value in bad)
+
+        categories = None
+        for field in {field for fields in self.required.values() for field in fields}:
+            values = columns.get(field)
+            if values is None:
+                values = [''] * len(next(iter(columns.values()), ()))
+            unique = distinct.get(field)
+            if unique is None:
+                unique = set(values)
+            empty = {value for value in unique if not value or value.isspace()}
+            if not empty:
+                continue
+            if categories is None:
+                categories = _categories(columns)
+            missing = {(category, value) for category, fields in self.required.items()
+                       if field in fields for value in empty}
+            # One set lookup per row, kept in C by map/compress
+            rows = compress(count(start), map(missing.__contains__, zip(categories, values)))
+            issues.extend(Issue(i, field, '', "required") for i in rows)
+
+        order = {field: n for n, field in enumerate(columns)}
+        issues.sort(key=lambda issue: (issue.row, order.get(issue.field, len(order))))
+        return issues
+
+    def _numbers_in_range(self, field, values):
+        """True when every value of a range field is a number in range
+
+        One C-level float/min/max pass; anything else (empty cells, bad
+        values) falls back to the per-value check.
+        """
+        limits = self.rules['ranges'].get(field)
+        if not limits or not values:
+            return False
+        try:
+            numbers = list(map(float, values))
+        except ValueError:
+            return False
+        # NaN (or inf - inf) makes the sum NaN, leave those to the slow path
+        total = sum(numbers)
+        return total == total and limits[0] <= min(numbers) and max(numbers) <= limits[1]
+
+    def check_rows(self, rows, chunk_rows=CHUNK_ROWS):
+        """Yield the issues of dict rows, checked column-wise per chunk"""
+        rows = iter(rows)
+        start = 1
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            columns = {field: [row.get(field) or '' for row in chunk] for field in chunk[0]}
+            yield from self.check_columns(columns, start)
+            start += len(chunk)
+
+
+def _categories(columns):
+    """Category of every row of a chunk, defaulted like row_category"""
+    cats = columns.get('category')
+    olts = columns.get('olt')
+    length = len(next(iter(columns.values())))
+    if cats is None:
+        cats = [''] * length
+    names = {cat: cat.strip().lower() for cat in set(cats)}
+    if '' not in names.values():
+        return list(map(names.__getitem__, cats))
+    if olts is None:
+        olts = [''] * length
+    return [names[cat] or ('feeder' if olt.strip() else 'cluster')
+            for cat, olt in zip(cats, olts)]
+
+
+def load_rules(path):
+    """Validator from a JSON rules file"""
+    with open(path, encoding='utf-8') as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict):
+        raise ValueError("rules must be an object of sections")
+    return Validator(rules)
+
+
+def validate_csv(input_path, output_path='-', validator=None, chunk_rows=CHUNK_ROWS):
+    """Check a batch input CSV, write one report line per issue
+
+    Returns (rows checked, issues found).
+    """
+    validator = validator or Validator()
+    rows = issues = 0
+    with gc_paused(), open_csv(input_path, 'r') as src, open_csv(output_path, 'w') as dst:
+        reader = csv.reader(src)
+        header = [name.strip() for name in next(reader, [])]
+        width = len(header)
+        writer = csv.writer(dst)
+        writer.writerow(REPORT_COLUMNS)
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            report = []
+            if set(map(len, chunk)) != {width}:
+                for i, row in enumerate(chunk):
+                    if len(row) != width:
+                        report.append(Issue(rows + i + 1, '', '',
+                                            f"{len(row)} fields, expected {width}"))
+                        chunk[i] = (row + [''] * width)[:width]
+            columns = dict(zip(header, zip(*chunk)))
+            report.extend(validator.check_columns(columns, rows + 1))
+            if len(report) > 1:
+                report.sort(key=lambda issue: issue.row)
+            writer.writerows(report)
+            rows += len(chunk)
+            issues += len(report)
+    return rows, issues
@@ -0,0 +1,25 @@
+"""Duplicate detection over a batch output CSV and a project store"""
+
+from cable_duplicates import find_duplicates, run_duplicates
+from cable_store import ProjectStore
+
+
+def test_store_keeps_same_name_segments(tmp_path):
+    path = str(tmp_path / 'project.db')
+    with ProjectStore(path) as store:
+        store.save(category='cluster', fdt='F1', line='A', cable_type='24C/2T', name='SAME')
+        store.save(category='cluster', fdt='F9', line='B', cable_type='24C/2T', name='SAME')
+        assert len(store) == 2
+
+    output = tmp_path / 'findings.csv'
+    assert run_duplicates(path, str(output)) == 1
+    assert output.read_text(encoding='utf-8').splitlines()[1] == \
+        'duplicate,SAME,2,cluster F1/A; cluster F9/B,1 2'
+
+
+def test_conflicting_cable_types():
+    rows = [{'category': 'feeder', 'olt': 'O1', 'fdt': 'F1', 'cable_type': '24C/2T', 'name': 'A'},
+            {'category': 'feeder', 'olt': 'O1', 'fdt': 'F1', 'cable_type': '48C/4T', 'name': 'B'}]
+    findings = list(find_duplicates(rows))
+    assert [(f.kind, f.key, f.values) for f in findings] == \
+        [('conflict', 'feeder O1/F1', ['24C/2T', '48C/4T'])]
@@ -0,0 +1,33 @@
+"""Incremental network model"""
+
+from cable_network import Network
+
+
+def test_cluster_rows_have_no_feeder_segment():
+    rows = [{'category': 'cluster', 'fdt': 'F1', 'line': 'A', 'route': '100',
+             'slack_fdt': '1', 'slack_fat': '1', 'cable_type': '24C/2T'}]
+    network = Network.from_rows(rows)
+    segments = list(network.segments())
+    assert [(segment.level, segment.code) for segment in segments] == [('line', 'A')]
+    assert network.total_length == segments[0].total_length == 147
+
+
+def test_feeder_row_adds_feeder_segment_to_cluster_fdt():
+    rows = [{'category': 'cluster', 'olt': 'O', 'fdt': 'F1', 'line': 'A', 'route': '100'},
+            {'category': 'feeder', 'olt': 'O', 'fdt': 'F1', 'route': '1000',
+             'cable_type': '48C/4T'}]
+    network = Network.from_rows(rows)
+    assert [segment.level for segment in network.segments()] == ['fdt', 'line']
+    assert network.find('O', 'F1').total_length == 1050
+
+
+def test_update_after_remove_leaves_totals():
+    network = Network()
+    line = network.line('O', 'F', 'A', route=100, slack_fat=0)
+    olt = network.find('O')
+    assert network.total_length == olt.subtree_length == 105
+    network.remove(line)
+    assert network.total_length == olt.subtree_length == 0
+    line.update(route=500)
+    assert network.total_length == olt.subtree_length == 0
+    assert line.total_length == 525